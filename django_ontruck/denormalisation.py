@@ -1,15 +1,22 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from functools import cached_property, partial
 from importlib import import_module
 from re import split
-from typing import Callable, Optional, Iterable, Mapping, Type, Sequence
+from threading import local, Lock
+from time import perf_counter, time
+from typing import Callable, Optional, Iterable, Iterator, List, Mapping, Tuple, Type, Sequence
 from uuid import uuid4
 
 from django.apps import apps
 from django.contrib.contenttypes.models import ContentTypeManager, ContentType
-from django.db.models import Model, OneToOneField, CASCADE, prefetch_related_objects
-from django.db.models.signals import post_save
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, transaction
+from django.db.models import Model, OneToOneField, CASCADE, F, QuerySet, prefetch_related_objects
+from django.db.models.signals import post_init, post_save
 from django.dispatch import Signal
 from django_ontruck.events import EventBase
 
@@ -58,6 +65,108 @@ def sync_handler(denormaliser, **_kwargs):
     denormaliser()
 
 
+def scheduled_on_commit(callback, using=None):
+    """
+    Whether `callback`, or a `partial` of it, is still waiting in
+    `transaction.on_commit` for the current transaction to be committed.
+    Django drops the callbacks of the transactions and savepoints that are
+    rolled back.
+    """
+    connection = transaction.get_connection(using)
+
+    return any(
+        getattr(entry[1], 'func', entry[1]) == callback
+        for entry in connection.run_on_commit
+    )
+
+
+def saved_changes(denormalised, instance, signal_kwargs):
+    """
+    `Listener` `changed` callable for `post_save` listeners of the parent
+    model: the saved `update_fields` or, when the whole instance was saved,
+    the fields that differ from its tracked snapshot. The snapshot is then
+    retaken, so the next save is compared against this one.
+    """
+    changed = denormalised.changed_fields(instance)
+    denormalised.take_snapshot(instance)
+
+    if signal_kwargs.get('created'):
+        return None
+
+    update_fields = signal_kwargs.get('update_fields')
+
+    if update_fields is not None:
+        return update_fields
+
+    return changed
+
+
+class CoalescingHandler:
+    """
+    A handler that buffers denormalisers until the current transaction is
+    committed, merging the fields of all the denormalisers of the same
+    instance so that it is only denormalised once. Denormalisers buffered
+    in a transaction that was rolled back are discarded on the next call,
+    once `is_scheduled` tells their flush is no longer pending.
+    """
+
+    def __init__(self, handler=sync_handler, on_commit=transaction.on_commit, is_scheduled=scheduled_on_commit):
+        self.handler = handler
+        self.on_commit = on_commit
+        self.is_scheduled = is_scheduled
+        self._local = local()
+
+    @property
+    def pending(self):
+        if not hasattr(self._local, 'pending'):
+            self._local.pending = {}
+
+        return self._local.pending
+
+    @staticmethod
+    def key(denormaliser):
+        return denormaliser.model_class, denormaliser.instance.pk
+
+    @staticmethod
+    def merge(pending, denormaliser):
+        triggered_ats = [
+            triggered_at for triggered_at in (pending.triggered_at, denormaliser.triggered_at)
+            if triggered_at is not None
+        ]
+
+        # the lag is measured from the first change
+        return replace(
+            denormaliser,
+            fields=tuple(dict.fromkeys((*pending.fields, *denormaliser.fields))),
+            triggered_at=min(triggered_ats, default=None),
+        )
+
+    def __call__(self, denormaliser, **_kwargs):
+        if self.pending and not self.is_scheduled(self.flush):
+            # the transaction that buffered them was rolled back
+            self.pending.clear()
+
+        key = self.key(denormaliser)
+
+        if key in self.pending:
+            denormaliser = self.merge(self.pending[key], denormaliser)
+
+        self.pending[key] = denormaliser
+
+        # Every call schedules a flush: only the first one to run after the
+        # commit finds the key pending.
+        self.on_commit(partial(self.flush, key))
+
+    def flush(self, key):
+        denormaliser = self.pending.pop(key, None)
+
+        if denormaliser is not None:
+            self.handler(denormaliser)
+
+
+coalescing_handler = CoalescingHandler()
+
+
 class Denormalised:
     """
     A descriptor class that is used to control denormalised data.
@@ -109,6 +218,8 @@ class Denormalised:
         denormalised_model_name: Optional[str] = None,
         related_name: Optional[str] = None,
         handler: Optional[Callable] = None,
+        track_changes: bool = False,
+        lazy: bool = False,
     ):
         """
 
@@ -118,6 +229,12 @@ class Denormalised:
         :param denormalised_model_name: the name of the denormalisation model
         :param related_name: The name the parent instance will use to refer to its denormalisation model instance
         :param handler: The handler that will be connected to Denormalise events.
+        :param track_changes: Whether to snapshot the fields properties depend on when parent instances are loaded
+            or saved, so `changed_fields` can tell which of them changed. `refresh_from_db` does not retake the
+            snapshot: call `take_snapshot` after refreshing an instance, or its next save is compared against the
+            values it had before.
+        :param lazy: Whether to create denormalisation model instances on the first denormalisation or access instead
+            of as soon as their parent instance is created.
         """
         self.model_base = model_base
         self.denormalised_properties = []
@@ -125,6 +242,8 @@ class Denormalised:
         self.field_name = field_name
         self._denormalised_model_name = denormalised_model_name
         self._related_name = related_name
+        self.track_changes = track_changes
+        self.lazy = lazy
 
         if handler:
             self.connect(handler)
@@ -144,10 +263,14 @@ class Denormalised:
 
         self.model_class = factory.export()
 
-        post_save.connect(self._post_save_handler, sender=owner)
+        if not self.lazy:
+            post_save.connect(self._post_save_handler, sender=owner)
 
         self.listen()
 
+        if self.track_changes:
+            post_init.connect(self._snapshot_handler, sender=owner)
+
         setattr(owner, name, self)
 
     @property
@@ -173,16 +296,35 @@ class Denormalised:
             )
         )
 
-    def denormaliser(self, instance, fields):
+    def denormaliser(self, instance, fields, triggered_at=None):
         if fields is None:
             fields = self.all_fields
 
         return Denormaliser(
-            self.model_class, self.field_name, self.name, instance, fields
+            self.model_class, self.field_name, self.name, instance, fields,
+            triggered_at=time() if triggered_at is None else triggered_at,
         )
 
-    def denormalise(self, instance, fields=None):
-        return self.denormaliser(instance, fields)()
+    def denormalise(self, instance, fields=None, refresh_after_update=False):
+        return self.denormaliser(instance, fields)(refresh_after_update)
+
+    def bulk_denormaliser(self, queryset, fields=None, batch_size=1000, triggered_at=None):
+        if fields is None:
+            fields = self.all_fields
+
+        return BulkDenormaliser(
+            self.model_class, self.field_name, self.name, queryset, fields,
+            batch_size=batch_size,
+            triggered_at=triggered_at,
+        )
+
+    def denormalise_queryset(self, queryset, fields=None, batch_size=1000, triggered_at=None):
+        """
+        Denormalise every instance of `queryset` in batches of `batch_size`,
+        prefetching once per batch and writing with `bulk_update` /
+        `bulk_create` instead of one `update_or_create` per instance.
+        """
+        return self.bulk_denormaliser(queryset, fields, batch_size, triggered_at)()
 
     @property
     def all_fields(self):
@@ -190,18 +332,54 @@ class Denormalised:
             [prop.name for prop in self.model_class.denormalised_properties]
         )
 
+    @property
+    def snapshot_attribute(self):
+        return '_{}_snapshot'.format(self.name)
+
+    @cached_property
+    def tracked_fields(self):
+        # the properties are all declared once the parent model is prepared
+        dependencies = {
+            self.field_name_for(dependency)
+            for prop in self.denormalised_properties
+            for dependency in (prop.depends_on or tuple())
+        }
+
+        return [
+            model_field for model_field in self.parent_model_class._meta.concrete_fields
+            if model_field.name in dependencies
+        ]
+
     def __get__(self, instance, owner):
         if not instance:
             return self
 
-        return getattr(instance, self.related_name)
+        try:
+            return getattr(instance, self.related_name)
+        except self.model_class.DoesNotExist:
+            if not self.lazy:
+                raise
+
+        denormalised, _ = self.model_class.objects.get_or_create(
+            **{self.field_name: instance}
+        )
+        self.model_class._meta.get_field(self.field_name).remote_field.set_cached_value(
+            instance, denormalised
+        )
+
+        return denormalised
 
-    def property(self, field, prefetches=tuple()):
+    def property(self, field, prefetches=tuple(), depends_on=None):
+        """
+        :param depends_on: The fields or relation paths (e.g. `items__quantity`) of the parent model the property is
+            computed from. `None` means it may depend on anything, so it is recomputed on every change.
+        """
         def decorator(func):
             denormalised_property = DenormalisedProperty(
                 func,
                 field=field,
-                prefetches=prefetches
+                prefetches=prefetches,
+                depends_on=depends_on,
             )
 
             self.denormalised_properties.append(denormalised_property)
@@ -216,6 +394,74 @@ class Denormalised:
                 **{self.field_name: instance}
             )
 
+    def create_denormalised(self, instances, batch_size=None):
+        """
+        Creates the denormalisation model instances of `instances` with a
+        single batched insert, as `post_save` does for instances created one
+        by one. Instances without a primary key are skipped, and so are the
+        ones that already have a denormalisation model instance.
+        """
+        return self.model_class.objects.bulk_create(
+            [
+                self.model_class(**{self.field_name: instance})
+                for instance in instances if instance.pk is not None
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+
+    def field_name_for(self, name):
+        root = name.split('__')[0]
+
+        try:
+            return self.parent_model_class._meta.get_field(root).name
+        except FieldDoesNotExist:
+            return root
+
+    def dependent_fields(self, changed: Iterable[str]):
+        """
+        The names of the properties that have to be recomputed when the
+        `changed` fields or relations of the parent model change.
+        """
+        changed = {self.field_name_for(name) for name in changed}
+
+        return tuple(
+            prop.name for prop in self.denormalised_properties
+            if prop.depends_on is None or any(
+                self.field_name_for(dependency) in changed
+                for dependency in prop.depends_on
+            )
+        )
+
+    def snapshot(self, instance):
+        return {
+            model_field.name: instance.__dict__.get(model_field.attname, missing)
+            for model_field in self.tracked_fields
+        }
+
+    def changed_fields(self, instance):
+        """
+        The tracked fields of `instance` that changed since it was loaded or
+        since the last `take_snapshot`, or `None` if its changes are not
+        tracked.
+        """
+        previous = getattr(instance, self.snapshot_attribute, None)
+
+        if previous is None:
+            return None
+
+        return tuple(
+            name for name, value in self.snapshot(instance).items()
+            if value is missing or previous[name] is missing or previous[name] != value
+        )
+
+    def take_snapshot(self, instance):
+        if self.track_changes:
+            setattr(instance, self.snapshot_attribute, self.snapshot(instance))
+
+    def _snapshot_handler(self, instance, **_kwargs):
+        self.take_snapshot(instance)
+
     def listen(self):
         for listener in self.listeners:
             listener.bind(self)
@@ -225,6 +471,68 @@ class Denormalised:
         Denormalise.connect(handler, sender=self, weak=False)
 
 
+def denormalised_descriptors(models=None):
+    """
+    Every `Denormalised` descriptor attached to `models`, all the installed
+    models by default.
+    """
+    for model in apps.get_models() if models is None else models:
+        for value in vars(model).values():
+            if isinstance(value, Denormalised):
+                yield value
+
+
+class DenormalisedQuerySet(QuerySet):
+    """
+    A queryset for models with `Denormalised` descriptors. `bulk_create`,
+    which does not send `post_save`, also creates the denormalisation model
+    instances of the created objects for non lazy descriptors.
+
+    Note that on backends that do not return primary keys from bulk
+    inserts (anything but PostgreSQL in Django 2.2) only objects created
+    with an explicit primary key get them.
+    """
+
+    def bulk_create(self, objs, batch_size=None, *args, **kwargs):
+        objs = super().bulk_create(objs, batch_size, *args, **kwargs)
+
+        for denormalised in denormalised_descriptors([self.model]):
+            if not denormalised.lazy:
+                denormalised.create_denormalised(objs, batch_size=batch_size)
+
+        return objs
+
+    def with_denormalised(self, *names, prefix=None):
+        """
+        Joins the denormalisation models of the `Denormalised` descriptors
+        called `names` and annotates their properties as
+        `<prefix><property>`, `<name>_<property>` by default, so they can be
+        used to filter and order. The joined instances are also selected, so
+        reading them through the descriptors does not query again.
+        """
+        queryset = self
+
+        for name in names:
+            denormalised = getattr(self.model, name)
+            annotation_prefix = f'{name}_' if prefix is None else prefix
+
+            annotations = {
+                f'{annotation_prefix}{field_name}': F(f'{denormalised.related_name}__{field_name}')
+                for field_name in denormalised.all_fields
+            }
+
+            for annotation in annotations:
+                if hasattr(self.model, annotation):
+                    raise ValueError(
+                        f'The annotation {annotation} clashes with an attribute of {self.model.__name__}, '
+                        f'use a different prefix'
+                    )
+
+            queryset = queryset.select_related(denormalised.related_name).annotate(**annotations)
+
+        return queryset
+
+
 class DenormalisedModelClassFactory:
     def __init__(
         self,
@@ -296,10 +604,20 @@ class Listener(ABC):
         fields=None,
         adapter=lambda instance, **_kwargs: instance,
         denormalise_event=Denormalise,
+        changed=None,
     ):
+        """
+        :param fields: The properties to denormalise, all of them if `None`
+        :param adapter: Maps the signal arguments to the parent instance to denormalise
+        :param denormalise_event: The event sent with the denormaliser
+        :param changed: The fields or relations of the parent model the signal reports as changed, either as names
+            or as a callable taking the owner, the instance and the signal kwargs (e.g. `saved_changes`). Only the
+            properties depending on them are denormalised.
+        """
         self.fields = fields
         self.adapter = adapter
         self.denormalise_event = denormalise_event
+        self.changed = changed
 
     @abstractmethod
     def connect(self):  # pragma: no cover
@@ -312,14 +630,35 @@ class Listener(ABC):
         f'set to an instance of `{Denormalised.__name__}` using the `{bind.__name__}` method'
     )
 
+    def fields_for(self, instance, signal_kwargs):
+        changed = self.changed
+
+        if callable(changed):
+            changed = changed(self.owner, instance, signal_kwargs)
+
+        if changed is None:
+            return self.fields
+
+        fields = self.owner.dependent_fields(changed)
+
+        if self.fields is None:
+            return fields
+
+        return tuple(name for name in fields if name in self.fields)
+
     def handle(self, *args, **kwargs):
         instance = self.adapter(*args, **kwargs)
 
         if instance is skip_denormalisation:
             return
 
+        fields = self.fields_for(instance, kwargs)
+
+        if fields is not None and not fields:
+            return
+
         self.denormalise_event(
-            denormaliser=self.owner.denormaliser(instance, self.fields),
+            denormaliser=self.owner.denormaliser(instance, fields),
         ).send_as_denormalised(denormalised=self.owner)
 
 
@@ -346,14 +685,163 @@ class EventListener(SignalListener):
 
 
 class DenormalisedProperty(property):
-    def __init__(self, fget, field, prefetches):
+    def __init__(self, fget, field, prefetches, depends_on=None):
         self.name = fget.__name__
         self.field = field
         self.prefetches = prefetches
+        self.depends_on = depends_on
 
         super().__init__(fget=fget)
 
 
+denormalisation_measured = Signal(providing_args=('metrics',))
+
+
+@dataclass
+class Phase:
+    duration: float = 0.0
+    queries: int = 0
+
+
+@dataclass
+class DenormalisationMetrics:
+    """
+    Sent with `denormalisation_measured`, whose sender is the
+    denormalisation model class. `lag` is the time in seconds between the
+    triggering of the denormalisation and the end of its write.
+    """
+
+    rows: int = 0
+    prefetch: Phase = field(default_factory=Phase)
+    compute: Phase = field(default_factory=Phase)
+    write: Phase = field(default_factory=Phase)
+    lag: Optional[float] = None
+
+    @property
+    def duration(self):
+        return self.prefetch.duration + self.compute.duration + self.write.duration
+
+    @property
+    def queries(self):
+        return self.prefetch.queries + self.compute.queries + self.write.queries
+
+
+class Instrumentation:
+    """
+    Measures the phases of a denormalisation and sends the resulting
+    `DenormalisationMetrics` through `signal`. Nothing is measured when the
+    signal has no receivers for `model_class`.
+    """
+
+    def __init__(self, model_class, triggered_at=None, signal=denormalisation_measured):
+        self.model_class = model_class
+        self.triggered_at = triggered_at
+        self.signal = signal
+        self.enabled = signal.has_listeners(model_class)
+        self.metrics = DenormalisationMetrics()
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        phase = getattr(self.metrics, name)
+
+        def count_queries(execute, *args):
+            phase.queries += 1
+
+            return execute(*args)
+
+        start = perf_counter()
+
+        with connections[self.model_class.objects.db].execute_wrapper(count_queries):
+            yield
+
+        phase.duration += perf_counter() - start
+
+    def finish(self, rows):
+        if not self.enabled:
+            return
+
+        self.metrics.rows += rows
+
+        if self.triggered_at is not None:
+            self.metrics.lag = time() - self.triggered_at
+
+        self.signal.send(self.model_class, metrics=self.metrics)
+
+
+@dataclass
+class WriteCounter:
+    written: int = 0
+    skipped: int = 0
+
+
+class WriteStats:
+    """
+    Counts, per denormalisation model class, how many rows were written and
+    how many writes were skipped because the denormalised values had not
+    changed.
+    """
+
+    def __init__(self):
+        self._counters = defaultdict(WriteCounter)
+        self._lock = Lock()
+
+    def record(self, model_class, written=0, skipped=0):
+        with self._lock:
+            counter = self._counters[model_class]
+            counter.written += written
+            counter.skipped += skipped
+
+    def __getitem__(self, model_class) -> WriteCounter:
+        with self._lock:
+            counter = self._counters.get(model_class, WriteCounter())
+
+            return WriteCounter(counter.written, counter.skipped)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+write_stats = WriteStats()
+
+
+def changed_fields(denormalised, values):
+    return tuple(
+        name for name, value in values.items()
+        if getattr(denormalised, name) != value
+    )
+
+
+def touch(denormalised):
+    """
+    Runs `pre_save` on the `auto_now` fields of `denormalised` and returns
+    their names, so they can be included in partial updates.
+    """
+    touched = []
+
+    for model_field in denormalised._meta.concrete_fields:
+        if getattr(model_field, 'auto_now', False):
+            model_field.pre_save(denormalised, add=False)
+            touched.append(model_field.name)
+
+    return tuple(touched)
+
+
+def collect_prefetches(denormalised_properties, fields):
+    return sum(
+        [
+            prop.prefetches
+            for prop in denormalised_properties
+            if prop.name in fields
+        ],
+        tuple()
+    )
+
+
 @dataclass
 class Denormaliser:
     """
@@ -371,35 +859,218 @@ class Denormaliser:
         compare=False,
         repr=False
     )
+    write_stats_: WriteStats = field(
+        default=write_stats,
+        compare=False,
+        repr=False
+    )
+    triggered_at: Optional[float] = field(default=None, compare=False)
 
     @property
     def prefetches(self):
-        return sum(
-            [
-                prop.prefetches
-                for prop in self.model_class.denormalised_properties
-                if prop.name in self.fields
-            ],
-            tuple()
+        return collect_prefetches(
+            self.model_class.denormalised_properties, self.fields
         )
 
     @property
     def model(self) -> Type[Model]:
         return self.instance.__class__
 
-    def __call__(self, refresh_after_update=True):
-        self.prefetch_related_objects_([self.instance], *self.prefetches)
+    def values(self):
+        return {field: getattr(self.instance, field) for field in self.fields}
 
-        self.model_class.objects.update_or_create(
-            **{self.parent_field_name: self.instance},
-            defaults={
-                field: getattr(self.instance, field) for field in self.fields
-            }
+    @property
+    def parent_field(self):
+        return self.model_class._meta.get_field(self.parent_field_name)
+
+    def write(self, values) -> Tuple[Model, bool]:
+        """
+        Writes only the changed `values`, returning the denormalisation model
+        instance and whether it was written at all.
+        """
+        # get_or_create retries the read if a concurrent write created it first
+        denormalised, created = self.model_class.objects.get_or_create(
+            **{self.parent_field_name: self.instance}, defaults=values
+        )
+
+        if created:
+            return denormalised, True
+
+        changed = changed_fields(denormalised, values)
+
+        if not changed:
+            return denormalised, False
+
+        for name in changed:
+            setattr(denormalised, name, values[name])
+
+        denormalised.save(update_fields=(*changed, *touch(denormalised)))
+
+        return denormalised, True
+
+    def update_cache(self, denormalised):
+        """
+        Updates the denormalisation model instance cached on the parent
+        instance in place, or caches `denormalised` if there is none.
+        """
+        relation = self.parent_field.remote_field
+        cached = relation.get_cached_value(self.instance, default=None)
+
+        if cached is None:
+            relation.set_cached_value(self.instance, denormalised)
+            self.parent_field.set_cached_value(denormalised, self.instance)
+            return
+
+        for name in self.fields:
+            setattr(cached, name, getattr(denormalised, name))
+
+    def __call__(self, refresh_after_update=False):
+        instrumentation = Instrumentation(self.model_class, self.triggered_at)
+
+        with instrumentation.phase('prefetch'):
+            self.prefetch_related_objects_([self.instance], *self.prefetches)
+
+        with instrumentation.phase('compute'):
+            values = self.values()
+
+        with instrumentation.phase('write'):
+            denormalised, written = self.write(values)
+
+        instrumentation.finish(rows=1)
+
+        self.write_stats_.record(
+            self.model_class,
+            written=int(written),
+            skipped=int(not written),
         )
 
         if refresh_after_update:
             self.instance.refresh_from_db()
 
+            # the snapshots must match the reloaded values
+            for denormalised in denormalised_descriptors([type(self.instance)]):
+                denormalised.take_snapshot(self.instance)
+        else:
+            self.update_cache(denormalised)
+
+
+@dataclass
+class BulkDenormaliser:
+    """
+    Given a queryset of the parent model class, creates or updates the
+    denormalisation model_class instances of all its rows, one batch at
+    a time.
+    """
+
+    model_class: Type[Model]
+    parent_field_name: str
+    denormalised_attr: str
+    queryset: QuerySet
+    fields: Sequence[str]
+    batch_size: int = 1000
+    prefetch_related_objects_: Callable = field(
+        default=prefetch_related_objects,
+        compare=False,
+        repr=False
+    )
+    write_stats_: WriteStats = field(
+        default=write_stats,
+        compare=False,
+        repr=False
+    )
+    triggered_at: Optional[float] = field(default=None, compare=False)
+
+    @property
+    def prefetches(self):
+        return collect_prefetches(
+            self.model_class.denormalised_properties, self.fields
+        )
+
+    @property
+    def parent_attname(self):
+        return self.model_class._meta.get_field(self.parent_field_name).attname
+
+    def batches(self) -> Iterator[List[Model]]:
+        batch = []
+
+        for instance in self.queryset.iterator(chunk_size=self.batch_size):
+            batch.append(instance)
+
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def existing(self, batch) -> Mapping[object, Model]:
+        return {
+            getattr(denormalised, self.parent_attname): denormalised
+            for denormalised in self.model_class.objects.filter(
+                **{f'{self.parent_field_name}__in': [instance.pk for instance in batch]}
+            )
+        }
+
+    def write_batch(self, batch, batch_values):
+        existing = self.existing(batch)
+        to_update, to_create, update_fields = [], [], {}
+
+        for instance, values in zip(batch, batch_values):
+            denormalised = existing.get(instance.pk)
+
+            if denormalised is None:
+                to_create.append(
+                    self.model_class(**{self.parent_field_name: instance}, **values)
+                )
+                continue
+
+            changed = changed_fields(denormalised, values)
+
+            if not changed:
+                continue
+
+            for name in changed:
+                setattr(denormalised, name, values[name])
+
+            update_fields.update(dict.fromkeys((*changed, *touch(denormalised))))
+            to_update.append(denormalised)
+
+        if to_update:
+            self.model_class.objects.bulk_update(to_update, list(update_fields))
+
+        if to_create:
+            # rows created meanwhile by a concurrent write already hold its values
+            self.model_class.objects.bulk_create(to_create, ignore_conflicts=True)
+
+        self.write_stats_.record(
+            self.model_class,
+            written=len(to_update) + len(to_create),
+            skipped=len(batch) - len(to_update) - len(to_create),
+        )
+
+    def denormalise_batch(self, batch, instrumentation):
+        with instrumentation.phase('prefetch'):
+            self.prefetch_related_objects_(batch, *self.prefetches)
+
+        with instrumentation.phase('compute'):
+            batch_values = [
+                {field: getattr(instance, field) for field in self.fields}
+                for instance in batch
+            ]
+
+        with instrumentation.phase('write'):
+            self.write_batch(batch, batch_values)
+
+    def __call__(self):
+        instrumentation = Instrumentation(self.model_class, self.triggered_at)
+        rows = 0
+
+        for batch in self.batches():
+            self.denormalise_batch(batch, instrumentation)
+            rows += len(batch)
+
+        instrumentation.finish(rows=rows)
+
 
 class SerialiseDenormaliser:
     def __init__(
@@ -416,7 +1087,8 @@ class SerialiseDenormaliser:
             'model_name': content_type.model,
             'denormalised_attr': denormaliser.denormalised_attr,
             'instance_id': denormaliser.instance.id,
-            'fields': list(denormaliser.fields)
+            'fields': list(denormaliser.fields),
+            'triggered_at': denormaliser.triggered_at,
         }
 
 
@@ -438,10 +1110,131 @@ class DeserialiseDenormaliser:
         instance = model.objects.get(id=denormaliser_data['instance_id'])
 
         denormaliser = denormalised.denormaliser(
-            instance, denormaliser_data['fields']
+            instance,
+            denormaliser_data['fields'],
+            triggered_at=denormaliser_data.get('triggered_at'),
         )
 
         return denormaliser
 
 
 deserialise_denormaliser = DeserialiseDenormaliser()
+
+
+class DenormaliseSerialised:
+    """
+    Worker side counterpart of `AsyncHandler`: merges the fields requested
+    for each instance, groups serialised denormalisers by
+    `(app_label, model_name, denormalised_attr)` and field set, and
+    denormalises each group in bulk, loading its instances with a single
+    query. Instances only recompute the fields requested for them.
+    """
+
+    def __init__(self, get_model=apps.get_model):
+        self.get_model = get_model
+
+    @staticmethod
+    def group(denormalisers_data: Iterable[Mapping]):
+        requests = defaultdict(lambda: (set(), []))
+
+        for data in denormalisers_data:
+            fields, triggered_ats = requests[
+                (data['app_label'], data['model_name'], data['denormalised_attr'], data['instance_id'])
+            ]
+            fields.update(data['fields'])
+
+            if data.get('triggered_at') is not None:
+                triggered_ats.append(data['triggered_at'])
+
+        groups = defaultdict(lambda: (dict(), []))
+
+        for (app_label, model_name, denormalised_attr, instance_id), (fields, triggered_ats) in requests.items():
+            instance_ids, group_triggered_ats = groups[
+                (app_label, model_name, denormalised_attr, tuple(sorted(fields)))
+            ]
+            instance_ids[instance_id] = None
+            group_triggered_ats.extend(triggered_ats)
+
+        return groups
+
+    def __call__(self, denormalisers_data: Iterable[Mapping]):
+        groups = self.group(denormalisers_data)
+
+        for key, (instance_ids, triggered_ats) in groups.items():
+            app_label, model_name, denormalised_attr, fields = key
+            model = self.get_model(app_label, model_name)
+            denormalised = getattr(model, denormalised_attr)
+
+            denormalised.denormalise_queryset(
+                model.objects.filter(id__in=list(instance_ids)),
+                fields=fields,
+                triggered_at=min(triggered_ats, default=None),
+            )
+
+
+denormalise_serialised = DenormaliseSerialised()
+
+
+class AsyncHandler:
+    """
+    A handler that serialises denormalisers and, once the current
+    transaction is committed, sends them to a celery `task` in batches of
+    up to `batch_size`. The task is expected to hand its argument over to
+    `denormalise_serialised`:
+
+    @app.task
+    def denormalise(denormalisers_data):
+        denormalise_serialised(denormalisers_data)
+
+    Denormalised(..., handler=AsyncHandler(denormalise))
+
+    As in `CoalescingHandler`, denormalisers buffered in a transaction that
+    was rolled back are discarded on the next call.
+    """
+
+    def __init__(
+        self,
+        task,
+        queue: Optional[str] = None,
+        batch_size: int = 100,
+        serialise: Callable = serialise_denormaliser,
+        on_commit: Callable = transaction.on_commit,
+        is_scheduled: Callable = scheduled_on_commit,
+    ):
+        self.task = task
+        self.queue = queue
+        self.batch_size = batch_size
+        self.serialise = serialise
+        self.on_commit = on_commit
+        self.is_scheduled = is_scheduled
+        self._local = local()
+
+    @property
+    def pending(self):
+        if not hasattr(self._local, 'pending'):
+            self._local.pending = []
+
+        return self._local.pending
+
+    @property
+    def celery_opts(self):
+        return {'queue': self.queue} if self.queue else {}
+
+    def __call__(self, denormaliser, **_kwargs):
+        if self.pending and not self.is_scheduled(self.flush):
+            # the transaction that buffered them was rolled back
+            self.pending.clear()
+
+        self.pending.append(self.serialise(denormaliser))
+
+        # As in `CoalescingHandler`, only the first flush after the commit
+        # finds anything pending.
+        self.on_commit(self.flush)
+
+    def flush(self):
+        pending, self._local.pending = self.pending, []
+
+        for start in range(0, len(pending), self.batch_size):
+            self.task.s(pending[start:start + self.batch_size]).apply_async(
+                **self.celery_opts
+            )
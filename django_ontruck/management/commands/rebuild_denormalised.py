@@ -0,0 +1,160 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Max, Min
+
+from django_ontruck.denormalisation import denormalised_descriptors
+
+
+def label(denormalised):
+    return f'{denormalised.parent_model_class._meta.label}.{denormalised.name}'
+
+
+def rebuild_chunk(model_label, denormalised_attr, start, end, fields, batch_size):
+    model = apps.get_model(model_label)
+    denormalised = getattr(model, denormalised_attr)
+
+    denormalised.denormalise_queryset(
+        model._base_manager.filter(pk__gte=start, pk__lt=end),
+        fields=fields,
+        batch_size=batch_size,
+    )
+
+    return start, end
+
+
+class Checkpoint:
+    """
+    The chunks already rebuilt for each descriptor, persisted as JSON after
+    every chunk so an interrupted rebuild can be resumed.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.done = {}
+
+        if path and os.path.exists(path):
+            with open(path) as checkpoint_file:
+                self.done = json.load(checkpoint_file)
+
+    def is_done(self, key, start, end):
+        return [start, end] in self.done.get(key, [])
+
+    def mark_done(self, key, start, end):
+        self.done.setdefault(key, []).append([start, end])
+
+        if not self.path:
+            return
+
+        temporary_path = f'{self.path}.tmp'
+
+        with open(temporary_path, 'w') as checkpoint_file:
+            json.dump(self.done, checkpoint_file)
+
+        os.replace(temporary_path, self.path)
+
+
+class Command(BaseCommand):
+    help = "Rebuild the tables of Denormalised descriptors"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'descriptors', nargs='*',
+            help='app_label.ModelName or app_label.ModelName.attribute of the descriptors to rebuild (default: all)',
+        )
+        parser.add_argument('--fields', nargs='+', help='Only rebuild these denormalised properties')
+        parser.add_argument('--processes', type=int, default=1, help='Number of worker processes')
+        parser.add_argument('--chunk-size', type=int, default=10000, help='Primary keys per chunk')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows written per query')
+        parser.add_argument('--checkpoint', help='JSON file used to record and resume progress')
+
+    def selected(self, descriptors):
+        selected = [
+            denormalised for denormalised in denormalised_descriptors()
+            if not descriptors or {label(denormalised), denormalised.parent_model_class._meta.label} & set(descriptors)
+        ]
+
+        if not selected:
+            raise CommandError(f'No Denormalised descriptors match {descriptors}')
+
+        return selected
+
+    @staticmethod
+    def fields_by_descriptor(selected, fields):
+        """
+        The requested `fields` each descriptor has, leaving out the
+        descriptors that have none of them.
+        """
+        if not fields:
+            return [(denormalised, None) for denormalised in selected]
+
+        unknown = set(fields).difference(*(denormalised.all_fields for denormalised in selected))
+
+        if unknown:
+            raise CommandError(f'No selected Denormalised descriptors have the fields {sorted(unknown)}')
+
+        return [
+            (denormalised, tuple(field for field in fields if field in denormalised.all_fields))
+            for denormalised in selected
+            if set(fields) & set(denormalised.all_fields)
+        ]
+
+    @staticmethod
+    def chunks(denormalised, chunk_size):
+        bounds = denormalised.parent_model_class._base_manager.aggregate(
+            start=Min('pk'), end=Max('pk')
+        )
+
+        if bounds['start'] is None:
+            return []
+
+        if not isinstance(bounds['start'], int):
+            raise CommandError(f'{label(denormalised)} does not have an integer primary key')
+
+        return [
+            (start, start + chunk_size)
+            for start in range(bounds['start'], bounds['end'] + 1, chunk_size)
+        ]
+
+    def handle(self, *args, **options):
+        checkpoint = Checkpoint(options['checkpoint'])
+        selected = self.fields_by_descriptor(self.selected(options['descriptors']), options['fields'])
+
+        for denormalised, fields in selected:
+            key = label(denormalised)
+            chunks = [
+                chunk for chunk in self.chunks(denormalised, options['chunk_size'])
+                if not checkpoint.is_done(key, *chunk)
+            ]
+            arguments = [
+                (denormalised.parent_model_class._meta.label, denormalised.name, start, end,
+                 fields, options['batch_size'])
+                for start, end in chunks
+            ]
+
+            self.stdout.write(f'[{self.style.WARNING(key)}]: {len(chunks)} chunks to rebuild')
+
+            for done, (start, end) in enumerate(self.run(arguments, options['processes']), start=1):
+                checkpoint.mark_done(key, start, end)
+                self.stdout.write(f' * {self.style.SUCCESS(f"{start}-{end}")} ({done}/{len(chunks)})')
+
+    @staticmethod
+    def run(arguments, processes):
+        if processes <= 1:
+            for chunk_arguments in arguments:
+                yield rebuild_chunk(*chunk_arguments)
+            return
+
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+
+        with ProcessPoolExecutor(max_workers=processes, mp_context=get_context('fork')) as executor:
+            futures = [executor.submit(rebuild_chunk, *chunk_arguments) for chunk_arguments in arguments]
+
+            for future in as_completed(futures):
+                yield future.result()
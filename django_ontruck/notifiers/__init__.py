@@ -1,14 +1,18 @@
 # flake8: noqa
 from .notifier import Notifier
-from .async_notifier import AsyncNotifier, MetaDelayedNotifier
+from .async_notifier import AsyncNotifier, MetaDelayedNotifier, NotifierBatch, notifier_batch
 from .push_notifier import PushNotifier
 from .mq_notifier import MQNotifier
 from .mq_locmem_client import MQLocMemClient
+from .mq_kombu_client import MQKombuClient
 from .segment_notifier import SegmentNotifier
 from .segment_locmem_client import SegmentLocMemClient
+from .segment_buffered_client import SegmentBufferedClient
 from .slack_notifier import SlackNotifier
 from .slack_locmem_client import SlackLocMemClient
-from .sms_notifier import SMSNotifier
+from .slack_aggregating_client import SlackAggregatingClient
+from .sms_notifier import SMSNotifier, BulkSMSNotifier
 from .sms_locmem_client import SmsLocMemClient
 from .customerio_notifier import CustomerIONotifier
 from .customerio_locmem_client import CustomerIOLocMemClient
+from .composite_notifier import CompositeNotifier
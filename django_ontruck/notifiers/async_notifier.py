@@ -1,6 +1,9 @@
-import sys
 import logging
-from django.db import models
+from functools import lru_cache
+from importlib import import_module
+from threading import local
+from django.conf import settings
+from django.db import models, transaction
 from django.contrib.contenttypes.models import ContentType
 
 from .notifier import Notifier
@@ -9,13 +12,35 @@ from .notifier import Notifier
 logger = logging.getLogger(__name__)
 
 
+# notifier classes by `notifier_class_path`, filled in by `MetaDelayedNotifier`
+notifier_registry = {}
+
+
+def class_path_for(cls):
+    return '.'.join([cls.__module__, cls.__name__])
+
+
+@lru_cache(maxsize=256)
+def import_class(class_path):
+    module, _, name = class_path.rpartition('.')
+
+    return getattr(import_module(module), name)
+
+
 def load_class(class_path):
+    """
+    Returns the class at the dotted `class_path`, looking up the notifier
+    registry first and importing its module otherwise, or `None` if it
+    cannot be loaded.
+    """
+    cls = notifier_registry.get(class_path)
+
+    if cls is not None:
+        return cls
+
     try:
-        components = class_path.split('.')
-        cls = components[-1]
-        module = '.'.join(components[:-1])
-        return getattr(sys.modules[module], cls)
-    except (KeyError, TypeError, AttributeError) as err:
+        return import_class(class_path)
+    except (ImportError, ValueError, TypeError, AttributeError) as err:
         logger.error(f'Cannot load class {class_path}\n{err}')
 
     return None
@@ -26,19 +51,24 @@ def to_primitives(*args, **kwargs):
     _kwargs = kwargs
     primitive_indexes = {}
     primitive_keys = {}
+    content_type_ids = {}
+
+    def content_type_id_for(obj):
+        if obj.__class__ not in content_type_ids:
+            content_type_ids[obj.__class__] = ContentType.objects.get_for_model(obj).id
+
+        return content_type_ids[obj.__class__]
 
     for index, obj in enumerate(_args):
         if isinstance(obj, models.Model):
-            content_type_id = ContentType.objects.get_for_model(obj).id
-            primitive_indexes[index] = content_type_id
+            primitive_indexes[index] = content_type_id_for(obj)
             _args[index] = obj.pk
 
     _kwargs['primitive_indexes'] = primitive_indexes
 
     for key, obj in _kwargs.items():
         if isinstance(obj, models.Model):
-            content_type_id = ContentType.objects.get_for_model(obj).id
-            primitive_keys[key] = content_type_id
+            primitive_keys[key] = content_type_id_for(obj)
             _kwargs[key] = obj.pk
 
     _kwargs['primitive_keys'] = primitive_keys
@@ -46,22 +76,141 @@ def to_primitives(*args, **kwargs):
     return (tuple(_args), _kwargs)
 
 
+def load_primitives(primitives):
+    """
+    Given `(content_type_id, pk)` pairs, loads their objects with one query
+    per content type, returning them keyed by the pairs.
+    """
+    pks_by_content_type = {}
+
+    for content_type_id, pk in primitives:
+        pks_by_content_type.setdefault(content_type_id, set()).add(pk)
+
+    objects = {}
+
+    for content_type_id, pks in pks_by_content_type.items():
+        content_type = ContentType.objects.get_for_id(content_type_id)
+        model_class = content_type.model_class()
+        # serialised primary keys (e.g. UUIDs) may not match the keys in_bulk returns
+        lookups = {pk: model_class._meta.pk.to_python(pk) for pk in pks}
+        loaded = model_class._base_manager.using(content_type._state.db).in_bulk(list(lookups.values()))
+
+        for pk, lookup in lookups.items():
+            if lookup not in loaded:
+                raise model_class.DoesNotExist(
+                    f'{model_class._meta.object_name} matching pk={pk} does not exist.'
+                )
+
+            objects[(content_type_id, pk)] = loaded[lookup]
+
+    return objects
+
+
 def from_primitives(*args, **kwargs):
     primitive_indexes = kwargs.pop('primitive_indexes', {})
+    primitive_keys = kwargs.pop('primitive_keys', {})
     _args = list(args)
     _kwargs = kwargs
 
-    for index, content_type_id in primitive_indexes.items():
-        _args[index] = ContentType.objects.get_for_id(content_type_id).get_object_for_this_type(pk=_args[index])
+    objects = load_primitives([
+        *[(content_type_id, _args[index]) for index, content_type_id in primitive_indexes.items()],
+        *[(content_type_id, _kwargs[key]) for key, content_type_id in primitive_keys.items()],
+    ])
 
-    primitive_keys = kwargs.pop('primitive_keys', {})
+    for index, content_type_id in primitive_indexes.items():
+        _args[index] = objects[(content_type_id, _args[index])]
 
     for key, content_type_id in primitive_keys.items():
-        _kwargs[key] = ContentType.objects.get_for_id(content_type_id).get_object_for_this_type(pk=_kwargs[key])
+        _kwargs[key] = objects[(content_type_id, _kwargs[key])]
 
     return (tuple(_args), _kwargs)
 
 
+class NotifierBatch:
+    """
+    Collects the celery signatures of the `AsyncNotifier`s sent inside it
+    and publishes them all through a single producer when it exits, or when
+    the current transaction is committed if `on_commit` is set. Nothing is
+    published if it exits with an exception. Nested batches join the
+    outermost one.
+    """
+    _local = local()
+
+    def __init__(self, on_commit=False):
+        self.on_commit = on_commit
+        self.pending = []
+        self.outermost = False
+
+    @classmethod
+    def current(cls):
+        return getattr(cls._local, 'current', None)
+
+    def add(self, signature, options):
+        self.pending.append((signature, options))
+
+    def __enter__(self):
+        if self.current() is None:
+            self._local.current = self
+            self.outermost = True
+
+        return self.current()
+
+    def __exit__(self, exc_type, *args):
+        if not self.outermost:
+            return
+
+        self._local.current = None
+
+        if exc_type is not None:
+            return
+
+        if self.on_commit:
+            transaction.on_commit(self.flush)
+        else:
+            self.flush()
+
+    def flush(self):
+        pending, self.pending = self.pending, []
+
+        if not pending:
+            return
+
+        with pending[0][0].app.producer_or_acquire() as producer:
+            for signature, options in pending:
+                signature.apply_async(producer=producer, **options)
+
+
+def notifier_batch(on_commit=False):
+    return NotifierBatch(on_commit=on_commit)
+
+
+# from the highest priority to the lowest
+LANES = ('critical', 'default', 'bulk')
+
+
+def highest_priority_lane(lanes):
+    """
+    The highest priority of `lanes`, lanes not in `LANES` ranking as
+    `default`.
+    """
+    def priority(lane):
+        return LANES.index(lane if lane in LANES else 'default')
+
+    return min(lanes, key=priority, default='default')
+
+
+def lane_options(lane, default_queue):
+    """
+    The celery options of `lane` in the `NOTIFIER_LANES` setting, e.g.
+    `{'critical': {'queue': 'celery.notifications.critical'}}`, sending to
+    `default_queue` unless the lane sets its own queue.
+    """
+    options = {'queue': default_queue}
+    options.update(getattr(settings, 'NOTIFIER_LANES', {}).get(lane, {}))
+
+    return options
+
+
 class AsyncNotifier(Notifier):
     __slots__ = ('notifier_class', 'notifier_args', 'notifier_kwargs',)
     default_queue = 'celery.notifications'
@@ -75,12 +224,12 @@ class AsyncNotifier(Notifier):
 
     @property
     def notifier_class_path(self):
-        return '.'.join([self.notifier_class.__module__, self.notifier_class.__name__])
+        return class_path_for(self.notifier_class)
 
     def send(self):
         if self.notifier_class:
             celery_opts = {
-                'queue': self.default_queue,
+                **lane_options(self.notifier_class.lane, self.default_queue),
                 'shadow': self.notifier_class_path
             }
 
@@ -91,16 +240,32 @@ class AsyncNotifier(Notifier):
 
             # transform object instances into IDs
             _args, _kwargs = to_primitives(*self.notifier_args, **self.notifier_kwargs)
+            signature = self.client.s(self.notifier_class_path, *_args, **_kwargs)
 
-            return self.client.s(self.notifier_class_path, *_args, **_kwargs).apply_async(**celery_opts)
+            batch = NotifierBatch.current()
+
+            if batch is not None:
+                # published when the batch exits
+                return batch.add(signature, celery_opts)
+
+            return signature.apply_async(**celery_opts)
 
 
 class MetaDelayedNotifier(type(Notifier)):
+    def __init__(cls, name, bases, namespace, **kwargs):
+        super().__init__(name, bases, namespace, **kwargs)
+
+        notifier_registry[class_path_for(cls)] = cls
+
     def __call__(cls, *args, **kwargs):
-        if 'delayed' not in kwargs and cls.is_default_delayed():
-            kwargs['delayed'] = True
-        notifier = cls.__new__(cls, *args, **kwargs)
-        if not isinstance(notifier, AsyncNotifier):
-            kwargs.pop('delayed', None)
-            notifier.__init__(*args, **kwargs)
-        return notifier
+        """
+        Delayed notifiers become an `async_class` instance with the
+        `delayed_arguments` of the call, without building the notifier,
+        others are built once as usual.
+        """
+        if kwargs.pop('delayed', cls.is_default_delayed()):
+            args, kwargs = cls.delayed_arguments(*args, **kwargs)
+
+            return cls.async_class(*args, notifier_class=cls, **kwargs)
+
+        return super().__call__(*args, **kwargs)
@@ -0,0 +1,109 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from django.db import connections
+
+from .notifier import Notifier
+from .async_notifier import AsyncNotifier, MetaDelayedNotifier, highest_priority_lane
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChannelResult:
+    notifier_class: type
+    response: Any = None
+    error: Optional[Exception] = None
+
+
+class CompositeNotifierError(Exception):
+    def __init__(self, results):
+        self.results = results
+        failed = [result.notifier_class.__name__ for result in results if result.error]
+
+        super().__init__(f'{len(failed)} notifiers failed: {failed}')
+
+
+class CompositeNotifier(Notifier, metaclass=MetaDelayedNotifier):
+    """
+    Sends every notifier in `notifier_classes` built with the same
+    arguments, from a single task when delayed so model arguments are
+    loaded once for all of them. Each channel is sent in isolation, from
+    `max_workers` threads if more than one, and failures are logged. A
+    `CompositeNotifierError` is only raised when every channel failed, so
+    retrying never sends a channel twice. Unless it sets its own `lane`, it
+    is routed through the highest priority lane of its `notifier_classes`.
+
+    .. code-block:: python
+
+        class LoadAssignedNotifier(CompositeNotifier):
+            notifier_classes = (LoadAssignedSegmentNotifier, LoadAssignedPushNotifier)
+
+        LoadAssignedNotifier(load).send()
+    """
+    __slots__ = ('args', 'kwargs',)
+    async_class = AsyncNotifier
+    notifier_classes = ()
+    max_workers = 1
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        if 'lane' not in cls.__dict__:
+            cls.lane = highest_priority_lane([notifier_class.lane for notifier_class in cls.notifier_classes])
+
+    @classmethod
+    def is_default_delayed(cls):
+        return True
+
+    def __init__(self, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+
+    @property
+    def client(self):
+        return None  # every channel uses its own client
+
+    def arguments_for(self, notifier_class):
+        """
+        The arguments `notifier_class` is built with, by default the ones of
+        the composite notifier.
+        """
+        return self.args, self.kwargs
+
+    def send_channel(self, notifier_class):
+        args, kwargs = self.arguments_for(notifier_class)
+
+        try:
+            return ChannelResult(notifier_class, response=notifier_class(*args, delayed=False, **kwargs).send())
+        except Exception as error:
+            logger.exception('Cannot send %s', notifier_class.__name__)
+
+            return ChannelResult(notifier_class, error=error)
+
+    def send_channel_in_thread(self, notifier_class):
+        try:
+            return self.send_channel(notifier_class)
+        finally:
+            connections.close_all()
+
+    def send(self):
+        if self.max_workers <= 1:
+            results = [self.send_channel(notifier_class) for notifier_class in self.notifier_classes]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(self.send_channel_in_thread, self.notifier_classes))
+
+        failed = [result for result in results if result.error]
+
+        # retrying after a partial failure would send the delivered channels again
+        if failed and len(failed) == len(results):
+            raise CompositeNotifierError(results)
+
+        if failed:
+            logger.warning('%s of %s notifiers failed', len(failed), len(results))
+
+        return results
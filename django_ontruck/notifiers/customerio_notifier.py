@@ -14,16 +14,6 @@ class CustomerIONotifier(Notifier, ABC, metaclass=MetaDelayedNotifier):
     def is_default_delayed(cls):
         return True
 
-    def __new__(cls, *args, **kwargs):
-        instance = super().__new__(cls)
-        is_delayed = kwargs.pop('delayed', False)
-        instance.__init__(*args, **kwargs)
-
-        if is_delayed:
-            return cls.async_class(*args, notifier_class=cls, **kwargs)
-        else:
-            return super().__new__(cls)
-
     def __init__(self):
         self.email_request = None
 
@@ -0,0 +1,80 @@
+from threading import Lock
+
+from kombu import Connection, Exchange, Queue
+from kombu.pools import producers
+
+
+class MQKombuChannel(object):
+    """
+    Publishes to an exchange and routing key through the per-process
+    producer pool of its client, whose producers keep their channels open
+    between messages. The exchange is declared with the `exchange_type` of
+    the client, unless it is one of the `amq.*` exchanges.
+    """
+
+    def __init__(self, client, queue_name, exchange_name, routing_key):
+        self.client = client
+        self.exchange = Exchange(exchange_name, type=client.exchange_type)
+        self.queue = Queue(queue_name, self.exchange, routing_key=routing_key)
+        self.declared = False
+
+    def basic_publish(self, exchange=None, routing_key=None, body=None, properties=None):
+        with producers[self.client.connection].acquire(block=True) as producer:
+            producer.publish(
+                body,
+                exchange=self.exchange if exchange in (None, self.exchange.name) else exchange,
+                routing_key=routing_key or self.queue.routing_key,
+                content_type='application/json',
+                content_encoding='utf-8',
+                declare=[] if self.declared else [self.queue],
+                retry=True,
+                retry_policy=self.client.retry_policy,
+                **(properties or {})
+            )
+
+        self.declared = True
+
+
+class MQKombuClient(object):
+    """
+    A `MQNotifier` client backed by kombu. Connections and producers come
+    from kombu's per-process pools, and channels are cached by
+    `(queue_name, exchange_name, routing_key)`, so publishing does not open
+    a channel per message. Publishing is retried, reconnecting if needed,
+    following `retry_policy`. Exchanges are declared as `exchange_type`, which
+    must match the type of the exchanges that already exist in the broker.
+
+    Use `for_url` to share a client per broker url in a process.
+    """
+    clients = {}
+    lock = Lock()
+    default_retry_policy = {
+        'max_retries': 3,
+        'interval_start': 0,
+        'interval_step': 1,
+        'interval_max': 5,
+    }
+
+    def __init__(self, url, confirm_publish=True, retry_policy=None, exchange_type='direct'):
+        self.connection = Connection(
+            url, transport_options={'confirm_publish': confirm_publish}
+        )
+        self.retry_policy = retry_policy or self.default_retry_policy
+        self.exchange_type = exchange_type
+        self.channels = {}
+
+    @classmethod
+    def for_url(cls, url, **kwargs):
+        with cls.lock:
+            if url not in cls.clients:
+                cls.clients[url] = cls(url, **kwargs)
+
+            return cls.clients[url]
+
+    def make_channel(self, queue_name, exchange_name, routing_key):
+        key = (queue_name, exchange_name, routing_key)
+
+        if key not in self.channels:
+            self.channels[key] = MQKombuChannel(self, queue_name, exchange_name, routing_key)
+
+        return self.channels[key]
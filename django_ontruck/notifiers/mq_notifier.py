@@ -14,13 +14,6 @@ class MQNotifier(Notifier, ABC, metaclass=MetaDelayedNotifier):
     def is_default_delayed(cls):
         return True
 
-    def __new__(cls, *args, **kwargs):
-        is_delayed = kwargs.pop('delayed', False)
-
-        if is_delayed:
-            return cls.async_class(*args, notifier_class=cls, **kwargs)
-        return super().__new__(cls)
-
     def __init__(self, queue_name, exchange_name=None, routing_key=None):
         self.queue_name = queue_name
         self.exchange_name = exchange_name or 'amq.direct'
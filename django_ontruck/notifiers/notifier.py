@@ -1,11 +1,103 @@
+import json
+import logging
 from abc import ABC, abstractmethod
+from functools import wraps
+from hashlib import sha1
+
+from django.db import models
+
+
+logger = logging.getLogger(__name__)
+
+
+def idempotent(send):
+    """
+    Skips `send` when the idempotency key of the notifier is already in its
+    `idempotency_store`. The key is released if `send` raises, so retries
+    can send it again.
+    """
+    @wraps(send)
+    def wrapper(self, *args, **kwargs):
+        store = self.idempotency_store
+
+        # nested calls, e.g. super().send(), are covered by the outermost one
+        if store is None or self.__dict__.get('sending_idempotently'):
+            return send(self, *args, **kwargs)
+
+        key = self.idempotency_key()
+
+        if key is None:
+            return send(self, *args, **kwargs)
+
+        if not store.add(key, self.idempotency_ttl):
+            logger.info('Skipping duplicated notification %s', key)
+            return None
+
+        self.sending_idempotently = True
+
+        try:
+            return send(self, *args, **kwargs)
+        except Exception:
+            store.delete(key)
+            raise
+        finally:
+            self.sending_idempotently = False
+
+    return wrapper
+
+
+def primitive(obj):
+    if isinstance(obj, models.Model):
+        return f'{obj._meta.label}:{obj.pk}'
+
+    return obj
 
 
 class Notifier(ABC):
+    # routed by the NOTIFIER_LANES setting, e.g. to 'critical', 'default' or 'bulk' queues
+    lane = 'default'
+    # e.g. a `LocMemTTLCache` or `DjangoTTLCache`, sends are not deduplicated without it
+    idempotency_store = None
+    idempotency_ttl = 60 * 60
+
+    def __new__(cls, *args, **kwargs):
+        notifier = super().__new__(cls)
+        notifier.call_arguments = (args, kwargs)
+
+        return notifier
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        if 'send' in cls.__dict__:
+            cls.send = idempotent(cls.__dict__['send'])
+
     @classmethod
     def is_default_delayed(cls):
         return False
 
+    @classmethod
+    def delayed_arguments(cls, *args, **kwargs):
+        """
+        The arguments a delayed notifier is built with in the worker.
+        """
+        return args, kwargs
+
+    def idempotency_key(self):
+        """
+        Identifies the notification for deduplication, by default from the
+        class path and the arguments it was built with, models by primary key.
+        """
+        args, kwargs = self.call_arguments
+        primitives = json.dumps(
+            [[primitive(arg) for arg in args], {key: primitive(value) for key, value in kwargs.items()}],
+            sort_keys=True,
+            default=str,
+        )
+        digest = sha1(primitives.encode()).hexdigest()
+
+        return f'notifier:{self.__class__.__module__}.{self.__class__.__name__}:{digest}'
+
     @property
     @abstractmethod
     def client(self):
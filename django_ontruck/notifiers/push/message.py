@@ -1,14 +1,17 @@
+import json
 from abc import ABC, abstractmethod
 from .device import Device
 
 
 class Message(ABC):
-    __slots__ = ('device_type', 'category', 'message',)
+    __slots__ = ('device_type', 'category', 'message', '_dict', '_json',)
 
     def __init__(self, device_type, category, message=None):
         self.message = message
         self.device_type = device_type
         self.category = category
+        self._dict = None
+        self._json = None
 
     @property
     def title(self):
@@ -23,9 +26,11 @@ class Message(ABC):
     def extra(self):
         raise NotImplementedError()
 
-    def to_dict(self):
-        if self.title and self.body:
-            return {'title': self.title, 'body': self.body}
+    def build_dict(self):
+        title, body = self.title, self.body
+
+        if title and body:
+            return {'title': title, 'body': body}
         else:
             d = {'message': self.message, 'extra': self.extra}
 
@@ -33,3 +38,22 @@ class Message(ABC):
                 d['use_fcm_notifications'] = False
 
             return d
+
+    def to_dict(self):
+        """
+        The payload of the message, built once: `title`, `body` and `extra`
+        are only evaluated on the first call.
+        """
+        if self._dict is None:
+            self._dict = self.build_dict()
+
+        return self._dict
+
+    def to_json(self):
+        """
+        The payload of the message serialised to JSON bytes, built once.
+        """
+        if self._json is None:
+            self._json = json.dumps(self.to_dict()).encode()
+
+        return self._json
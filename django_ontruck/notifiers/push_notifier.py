@@ -1,26 +1,60 @@
-import json
+import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from django.db import connections
+from django.db.models import QuerySet
 
 from .push.device import Device
 from .async_notifier import AsyncNotifier, MetaDelayedNotifier
 from .notifier import Notifier
 
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PushResult:
+    device_type: Device
+    devices: Any
+    response: Any = None
+    error: Optional[Exception] = None
+    # `(device, error)` pairs of the web devices that could not be delivered to
+    failures: List[tuple] = field(default_factory=list)
+
+
+class WebPushDeliveryError(Exception):
+    def __init__(self, failures):
+        self.failures = failures
+
+        super().__init__(f'{len(failures)} web push deliveries failed: {[error for _, error in failures]}')
+
+
+class PushDispatchError(Exception):
+    def __init__(self, results):
+        self.results = results
+        errors = [result.error for result in results if result.error]
+
+        super().__init__(f'{len(errors)} push deliveries failed: {errors}')
+
+
 class PushNotifier(Notifier, ABC, metaclass=MetaDelayedNotifier):
     async_class = AsyncNotifier
+    lane = 'critical'
+    # devices sent to in a single provider call, e.g. FCM multicast accepts up to 500
+    chunk_size = 500
+    # more than one worker sends the chunks concurrently from a thread pool
+    max_workers = 1
+    # more than one sends the web pushes of a chunk concurrently, with at most this many in flight
+    web_max_in_flight = 1
+    expired_web_status_codes = (404, 410)
 
     @classmethod
     def is_default_delayed(cls):
         return True
 
-    def __new__(cls, *args, **kwargs):
-        is_delayed = kwargs.pop('delayed', False)
-
-        if is_delayed:
-            return cls.async_class(*args, notifier_class=cls, **kwargs)
-        else:
-            return super().__new__(cls)
-
     @property
     def client(self):
         return None  # clients are managed by device providers
@@ -46,9 +80,34 @@ class PushNotifier(Notifier, ABC, metaclass=MetaDelayedNotifier):
     def devices(self, device_provicer):
         raise NotImplementedError()
 
-    def send(self):
+    def chunks(self, devices):
+        """
+        Splits querysets and lists of devices in chunks of `chunk_size`.
+        Querysets are split by primary key, resolved with a single query.
+        """
+        if not self.chunk_size:
+            return [devices]
+
+        if isinstance(devices, QuerySet):
+            pks = list(devices.values_list('pk', flat=True))
+
+            return [
+                devices.filter(pk__in=pks[start:start + self.chunk_size])
+                for start in range(0, len(pks), self.chunk_size)
+            ]
+
+        if isinstance(devices, (list, tuple)):
+            return [
+                devices[start:start + self.chunk_size]
+                for start in range(0, len(devices), self.chunk_size)
+            ]
+
+        return [devices]
+
+    def jobs(self):
         device_types = [device_type for _, device_type in Device.__members__.items() if
                         self.is_available_for_device_type(device_type)]
+
         for device_type in device_types:
             msg = self.message(device_type)
 
@@ -56,11 +115,127 @@ class PushNotifier(Notifier, ABC, metaclass=MetaDelayedNotifier):
             devices = self.devices(device_provider)
 
             if device_type == Device.WEB:
-                web_json = json.dumps(msg.to_dict())
-                for device in devices:
-                    self.send_web_device(device, web_json)
+                web_json = msg.to_json()
+
+                for chunk in self.chunks(list(devices)):
+                    yield device_type, chunk, web_json
             else:
-                devices.send_message(**msg.to_dict())
+                payload = msg.to_dict()
+
+                for chunk in self.chunks(devices):
+                    yield device_type, chunk, payload
+
+    def send_chunk(self, device_type, devices, payload):
+        if device_type == Device.WEB:
+            delivered, failures = self.send_web_devices(devices, payload)
+
+            return PushResult(device_type, devices, response=delivered, failures=failures)
+
+        return PushResult(device_type, devices, response=devices.send_message(**payload))
+
+    def deliver_web_device(self, device, web_json):
+        try:
+            self.send_web_device(device, web_json)
+        except Exception as error:
+            return error
+
+        return None
+
+    def deliver_web_device_in_thread(self, device, web_json):
+        try:
+            return self.deliver_web_device(device, web_json)
+        finally:
+            connections.close_all()
+
+    def is_expired_web_device_error(self, error):
+        response = getattr(error, 'response', None)
+
+        return getattr(response, 'status_code', None) in self.expired_web_status_codes
+
+    def prune_web_devices(self, devices):
+        """
+        Called with the web devices whose subscriptions have expired, e.g. to
+        deactivate them.
+        """
+
+    def send_web_devices(self, devices, web_json):
+        """
+        Sends `web_json` to every device, returning the delivered ones and
+        the `(device, error)` pairs of the failed ones. Expired subscriptions
+        are passed to `prune_web_devices`. Failures are only raised as a
+        `WebPushDeliveryError` when no device was delivered to, so retrying
+        never sends a push twice.
+        """
+        if self.web_max_in_flight <= 1 or len(devices) <= 1:
+            errors = [self.deliver_web_device(device, web_json) for device in devices]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.web_max_in_flight, len(devices))) as executor:
+                errors = list(executor.map(
+                    lambda device: self.deliver_web_device_in_thread(device, web_json), devices
+                ))
+
+        delivered, expired, failures = [], [], []
+
+        for device, error in zip(devices, errors):
+            if error is None:
+                delivered.append(device)
+            elif self.is_expired_web_device_error(error):
+                expired.append(device)
+            else:
+                failures.append((device, error))
+
+        if expired:
+            self.prune_web_devices(expired)
+
+        # retrying after a partial failure would send the delivered pushes again
+        if failures and not delivered:
+            raise WebPushDeliveryError(failures)
+
+        if failures:
+            logger.warning('%s of %s web pushes failed', len(failures), len(devices))
+
+        return delivered, failures
+
+    def run_job(self, device_type, devices, payload):
+        try:
+            return self.send_chunk(device_type, devices, payload)
+        except Exception as error:
+            logger.exception('Cannot send %s push notifications', device_type.value)
+
+            return PushResult(device_type, devices, error=error)
+
+    def run_job_in_thread(self, *job):
+        try:
+            return self.run_job(*job)
+        finally:
+            connections.close_all()
+
+    def dispatch(self, jobs):
+        if self.max_workers <= 1:
+            return [self.run_job(*job) for job in jobs]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(lambda job: self.run_job_in_thread(*job), jobs))
+
+    def send(self):
+        """
+        Sends the message of every available device type to its devices,
+        chunk by chunk, and returns a `PushResult` per chunk. Every chunk is
+        attempted and failures are logged. A `PushDispatchError` is only
+        raised when no chunk was delivered, so retrying never sends a push
+        twice.
+        """
+        results = self.dispatch(list(self.jobs()))
+        failed = [result for result in results if result.error]
+
+        # retrying after a partial failure would send the delivered chunks again
+        if failed and len(failed) == len(results):
+            raise PushDispatchError(results)
+
+        if failed:
+            logger.warning('%s of %s push chunks failed', len(failed), len(results))
+
+        return results
 
     def send_web_device(self, device, web_json):
         device.send_message(web_json)
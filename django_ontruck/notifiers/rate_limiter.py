@@ -0,0 +1,33 @@
+from threading import Lock
+from time import monotonic, sleep
+
+
+class TokenBucket(object):
+    """
+    Limits calls to `rate` per second on average, allowing bursts of up to
+    `capacity`. `acquire` reserves its tokens straight away, going into debt
+    if needed, and sleeps until they would have been available, so callers
+    from several threads are served in order.
+    """
+
+    def __init__(self, rate, capacity=None, clock=monotonic, sleep=sleep):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.capacity
+        self.updated_at = clock()
+        self.lock = Lock()
+
+    def acquire(self, tokens=1):
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+
+        if wait:
+            self.sleep(wait)
+
+        return wait
@@ -0,0 +1,142 @@
+import atexit
+import json
+import logging
+from base64 import b64encode
+from threading import Event, Lock, Thread
+from time import monotonic
+from urllib.request import Request, urlopen
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentBatchUpload(object):
+    """
+    Uploads a batch of messages to Segment's HTTP batch endpoint.
+    """
+    endpoint = 'https://api.segment.io/v1/batch'
+
+    def __init__(self, write_key, endpoint=None, timeout=10):
+        self.write_key = write_key
+        self.endpoint = endpoint or self.endpoint
+        self.timeout = timeout
+
+    @property
+    def headers(self):
+        credentials = b64encode(f'{self.write_key}:'.encode()).decode()
+
+        return {
+            'Authorization': f'Basic {credentials}',
+            'Content-Type': 'application/json',
+        }
+
+    def __call__(self, batch):
+        request = Request(
+            self.endpoint,
+            data=json.dumps({'batch': batch}, default=str).encode(),
+            headers=self.headers,
+            method='POST',
+        )
+
+        with urlopen(request, timeout=self.timeout) as response:
+            return response.status
+
+
+class SegmentBufferedClient(object):
+    """
+    A Segment client with the `identify` / `track` interface of
+    `SegmentLocMemClient` that buffers messages in memory and uploads them
+    in batches of up to `max_batch_size`, or every `flush_interval` seconds
+    from a background thread. Batches that fail to upload are retried up to
+    `max_retries` times, waiting `retry_backoff` seconds doubled on every
+    attempt, before they are dropped. Buffered messages are flushed on exit.
+    """
+
+    def __init__(self, key, upload=None, max_batch_size=100, flush_interval=5.0, max_retries=3,
+                 retry_backoff=1.0, clock=monotonic):
+        self.write_key = key
+        self.upload = upload or SegmentBatchUpload(key)
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.clock = clock
+        self.buffer = []
+        # (batch, attempts, retry_at) of the batches that failed to upload
+        self.failed = []
+        self.lock = Lock()
+        self.stopped = Event()
+        self.thread = None
+
+        atexit.register(self.shutdown)
+
+    def identify(self, user_id, traits=None, **kwargs):
+        self.enqueue({'type': 'identify', 'userId': user_id, 'traits': traits or {}, **kwargs})
+
+    def track(self, user_id, event, timestamp=None, properties=None, **kwargs):
+        self.enqueue({
+            'type': 'track',
+            'userId': user_id,
+            'event': event,
+            'timestamp': timestamp.isoformat() if timestamp else None,
+            'properties': properties or {},
+            **kwargs,
+        })
+
+    def enqueue(self, message):
+        self.start()
+
+        with self.lock:
+            self.buffer.append(message)
+            full = len(self.buffer) >= self.max_batch_size
+
+        if full:
+            self.flush()
+
+    def flush(self, force=False):
+        """
+        Uploads the buffered messages and the failed batches due for a
+        retry, or every failed batch if `force`.
+        """
+        now = self.clock()
+
+        with self.lock:
+            batch, self.buffer = self.buffer, []
+            retries = [(chunk, attempts) for chunk, attempts, retry_at in self.failed if force or retry_at <= now]
+            self.failed = [failed for failed in self.failed if not (force or failed[2] <= now)]
+
+        chunks = retries + [
+            (batch[start:start + self.max_batch_size], 0) for start in range(0, len(batch), self.max_batch_size)
+        ]
+
+        for chunk, attempts in chunks:
+            try:
+                self.upload(chunk)
+            except Exception:
+                self.retry(chunk, attempts + 1)
+
+    def retry(self, chunk, attempts):
+        if attempts > self.max_retries:
+            logger.exception('Dropping %s segment messages after %s attempts', len(chunk), attempts)
+            return
+
+        logger.warning('Cannot upload %s segment messages, retrying', len(chunk), exc_info=True)
+
+        with self.lock:
+            self.failed.append((chunk, attempts, self.clock() + self.retry_backoff * 2 ** (attempts - 1)))
+
+    def start(self):
+        if self.flush_interval is None or self.thread is not None:
+            return
+
+        with self.lock:
+            if self.thread is None:
+                self.thread = Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while not self.stopped.wait(self.flush_interval):
+            self.flush()
+
+    def shutdown(self):
+        self.stopped.set()
+        self.flush(force=True)
@@ -1,32 +1,39 @@
+import json
+import os
 from abc import ABC
 from datetime import datetime
+from hashlib import sha1
+from threading import Lock
 
 from .notifier import Notifier
 from .async_notifier import AsyncNotifier, MetaDelayedNotifier
 from .segment_locmem_client import SegmentLocMemClient
+from .ttl_cache import LocMemTTLCache
 
 
 class SegmentNotifier(Notifier, ABC, metaclass=MetaDelayedNotifier):
     __slots__ = ('timestamp', 'user', )
     client_pool = {}
+    client_pool_lock = Lock()
+    client_class = SegmentLocMemClient
+    # identical identify calls are skipped for identify_ttl seconds, set identify_cache to None to disable it
+    identify_cache = LocMemTTLCache(max_size=10000)
+    identify_ttl = 60 * 60
     event_id = None
     async_class = AsyncNotifier
+    lane = 'bulk'
 
     @classmethod
     def is_default_delayed(cls):
         return True
 
-    def __new__(cls, *args, **kwargs):
-        instance = super().__new__(cls)
-        is_delayed = kwargs.pop('delayed', False)
-        instance.__init__(*args, **kwargs)
+    @classmethod
+    def delayed_arguments(cls, *args, **kwargs):
+        # keep the time the event was created rather than the time it is sent
+        if not kwargs.get('timestamp'):
+            kwargs['timestamp'] = datetime.now()
 
-        if is_delayed:
-            # Get timestamp when the event was created by allow passing it or having a default one
-            kwargs.setdefault('timestamp', instance.timestamp)
-            return cls.async_class(*args, notifier_class=cls, **kwargs)
-        else:
-            return super().__new__(cls)
+        return args, kwargs
 
     def __init__(self, user=None, timestamp=None):
         self.timestamp = datetime.now() if not timestamp else timestamp
@@ -38,7 +45,20 @@ class SegmentNotifier(Notifier, ABC, metaclass=MetaDelayedNotifier):
 
     @property
     def client(self):
-        return SegmentLocMemClient(None)
+        # subclasses with another client class must not share the same client
+        key = (self.client_class, self.segment_key)
+
+        with self.client_pool_lock:
+            if key not in self.client_pool:
+                self.client_pool[key] = self.client_class(self.segment_key)
+
+            return self.client_pool[key]
+
+    @classmethod
+    def flush_clients(cls, **_kwargs):
+        for client in list(cls.client_pool.values()):
+            if hasattr(client, 'flush'):
+                client.flush()
 
     @property
     def identify_properties(self):
@@ -52,12 +72,47 @@ class SegmentNotifier(Notifier, ABC, metaclass=MetaDelayedNotifier):
     def message(self):
         return {}
 
+    def identify_key(self, properties):
+        properties = json.dumps(properties, sort_keys=True, default=str)
+
+        return f'segment_identify:{self.segment_key}:{self.uuid}:{sha1(properties.encode()).hexdigest()}'
+
+    def should_identify(self, properties):
+        if not properties:
+            return False
+
+        if self.identify_cache is None:
+            return True
+
+        return self.identify_cache.add(self.identify_key(properties), self.identify_ttl)
+
     def send(self):
         if not self.uuid:
             return
 
-        if self.identify_properties:
-            self.client.identify(self.uuid, self.identify_properties)
+        # it can be expensive to build, so it is only built once
+        properties = self.identify_properties
+
+        if self.should_identify(properties):
+            try:
+                self.client.identify(self.uuid, properties)
+            except Exception:
+                # so a retry identifies again
+                if self.identify_cache is not None:
+                    self.identify_cache.delete(self.identify_key(properties))
+                raise
 
         if self.event_id:
             self.client.track(self.uuid, self.event_id, timestamp=self.timestamp, properties=self.message)
+
+
+# pooled clients and their flushing threads do not survive a fork
+os.register_at_fork(after_in_child=SegmentNotifier.client_pool.clear)
+
+try:
+    from celery.signals import worker_process_shutdown, worker_shutdown
+except ImportError:  # pragma: no cover
+    pass
+else:
+    worker_process_shutdown.connect(SegmentNotifier.flush_clients, weak=False)
+    worker_shutdown.connect(SegmentNotifier.flush_clients, weak=False)
@@ -0,0 +1,252 @@
+import atexit
+import logging
+import os
+from threading import Event, Lock, Thread
+from time import monotonic
+from weakref import WeakSet
+
+logger = logging.getLogger(__name__)
+
+
+class SlackAggregatingChat(object):
+
+    def __init__(self, client):
+        self.client = client
+
+    def post_message(self, channel, text=None, **kwargs):
+        self.client.enqueue(channel, text, kwargs)
+
+
+class SlackAggregatingClient(object):
+    """
+    Wraps a Slack client, e.g. `SlackLocMemClient`, buffering the messages
+    posted through `chat.post_message` per channel. Messages that have
+    waited for `window` seconds are merged with the ones queued after them
+    with the same options, and posted at most every `min_interval` seconds
+    per channel, from a background thread polling every `poll_interval`
+    seconds. With `thread_replies` the first message is posted to the
+    channel and the rest as a reply in its thread.
+
+    When Slack answers with a 429 the messages are queued again and the
+    channel is not posted to until its `Retry-After` has passed. Pending
+    messages are flushed on exit. Notifiers share a client per process
+    through `shared`.
+    """
+    clients = WeakSet()
+    shared_clients = {}
+    shared_clients_lock = Lock()
+    # a Retry-After of 0 would let a rate limited channel be retried straight away
+    min_retry_after = 1.0
+
+    def __init__(self, client, window=1.0, min_interval=1.0, max_messages=20, thread_replies=False,
+                 separator='\n', poll_interval=0.25, clock=monotonic):
+        self.client = client
+        self.window = window
+        self.min_interval = min_interval
+        self.max_messages = max_messages
+        self.thread_replies = thread_replies
+        self.separator = separator
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.chat = SlackAggregatingChat(self)
+        self.buffers = {}
+        self.next_post_at = {}
+        self.retry_at = {}
+        self.lock = Lock()
+        self.stopped = Event()
+        self.thread = None
+
+        self.clients.add(self)
+
+    @classmethod
+    def shared(cls, client_class, **kwargs):
+        """
+        The client of this process wrapping a `client_class` instance with
+        the options in `kwargs`, built on first use.
+        """
+        key = (client_class, tuple(sorted(kwargs.items())))
+
+        with cls.shared_clients_lock:
+            if key not in cls.shared_clients:
+                cls.shared_clients[key] = cls(client_class(), **kwargs)
+
+            return cls.shared_clients[key]
+
+    @property
+    def api(self):
+        return self.client.api
+
+    def enqueue(self, channel, text, options):
+        self.start()
+
+        with self.lock:
+            self.buffers.setdefault(channel, []).append((self.clock(), text, options))
+
+    def is_due(self, channel, now, force):
+        messages = self.buffers[channel]
+
+        if not messages or now < self.retry_at.get(channel, 0):
+            return False
+
+        if force:
+            return True
+
+        return now >= self.next_post_at.get(channel, 0) and now - messages[0][0] >= self.window
+
+    def take(self, channel):
+        """
+        Pops the first messages of `channel` that can be merged in a post.
+        """
+        messages = self.buffers[channel]
+        options = messages[0][2]
+        count = 1
+
+        while count < min(len(messages), self.max_messages) and messages[count][2] == options:
+            count += 1
+
+        batch, self.buffers[channel] = messages[:count], messages[count:]
+
+        return batch
+
+    def requeue(self, channel, batch, retry_after):
+        with self.lock:
+            self.buffers[channel] = batch + self.buffers.get(channel, [])
+            self.retry_at[channel] = self.clock() + max(retry_after, self.min_retry_after)
+
+    def flush(self, force=True):
+        """
+        Posts the next messages of every channel that is not waiting for a
+        `Retry-After`, also the ones still within their `window` or
+        `min_interval` if `force`. Returns the number of posts attempted.
+        """
+        now = self.clock()
+
+        with self.lock:
+            batches = [
+                (channel, self.take(channel)) for channel in list(self.buffers) if self.is_due(channel, now, force)
+            ]
+
+        for channel, batch in batches:
+            self.post(channel, batch)
+
+        return len(batches)
+
+    def post(self, channel, batch):
+        options = batch[0][2]
+        texts = [text for _, text, _ in batch]
+
+        if self.thread_replies and len(batch) > 1:
+            response = self.post_message(channel, texts[0], options, batch)
+
+            if response is None:
+                return
+
+            thread_ts = self.thread_ts(response)
+
+            if thread_ts:
+                # replies queued again after a rate limit stay in the thread
+                options = {**options, 'thread_ts': thread_ts}
+
+            batch = [(queued_at, text, options) for queued_at, text, _ in batch[1:]]
+            texts = texts[1:]
+
+        self.post_message(channel, self.separator.join(texts), options, batch)
+
+    def post_message(self, channel, text, options, batch):
+        try:
+            response = self.client.chat.post_message(channel, text, **options)
+        except Exception as error:
+            retry_after = self.retry_after(error)
+
+            if retry_after is None:
+                logger.exception('Cannot post %s messages to slack channel %s', len(batch), channel)
+            else:
+                self.requeue(channel, batch, retry_after)
+
+            return None
+
+        with self.lock:
+            self.next_post_at[channel] = max(self.next_post_at.get(channel, 0), self.clock() + self.min_interval)
+
+        return response
+
+    @staticmethod
+    def retry_after(error):
+        response = getattr(error, 'response', None)
+
+        if getattr(response, 'status_code', None) != 429:
+            return None
+
+        return float((getattr(response, 'headers', None) or {}).get('Retry-After', 1))
+
+    @staticmethod
+    def thread_ts(response):
+        body = getattr(response, 'body', response)
+
+        try:
+            return body.get('ts')
+        except AttributeError:
+            return None
+
+    def start(self):
+        if self.poll_interval is None or self.thread is not None:
+            return
+
+        with self.lock:
+            if self.thread is None:
+                self.thread = Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while not self.stopped.wait(self.poll_interval):
+            self.flush(force=False)
+
+    def shutdown(self):
+        self.stopped.set()
+
+        with self.lock:
+            rounds = sum(len(messages) for messages in self.buffers.values())
+
+        # every round posts at least a message of each channel that is not rate limited
+        for _ in range(rounds):
+            if not self.flush():
+                break
+
+        with self.lock:
+            pending = sum(len(messages) for messages in self.buffers.values())
+
+        if pending:
+            logger.warning('Dropping %s slack messages waiting for a Retry-After', pending)
+
+    def reset(self):
+        self.buffers = {}
+        self.next_post_at = {}
+        self.retry_at = {}
+        self.lock = Lock()
+        self.stopped = Event()
+        self.thread = None
+
+    @classmethod
+    def shutdown_clients(cls, **_kwargs):
+        for client in list(cls.clients):
+            client.shutdown()
+
+    @classmethod
+    def reset_clients(cls):
+        # messages, threads and locks belong to the parent process
+        cls.shared_clients_lock = Lock()
+
+        for client in list(cls.clients):
+            client.reset()
+
+
+atexit.register(SlackAggregatingClient.shutdown_clients)
+os.register_at_fork(after_in_child=SlackAggregatingClient.reset_clients)
+
+try:
+    from celery.signals import worker_process_shutdown, worker_shutdown
+except ImportError:  # pragma: no cover
+    pass
+else:
+    worker_process_shutdown.connect(SlackAggregatingClient.shutdown_clients, weak=False)
+    worker_shutdown.connect(SlackAggregatingClient.shutdown_clients, weak=False)
@@ -3,29 +3,33 @@ from datetime import datetime
 
 from .notifier import Notifier
 from .async_notifier import AsyncNotifier, MetaDelayedNotifier
+from .slack_aggregating_client import SlackAggregatingClient
 from .slack_locmem_client import SlackLocMemClient
 
 
 class SlackNotifier(Notifier, ABC, metaclass=MetaDelayedNotifier):
     slack_client = None
+    slack_client_class = SlackLocMemClient
+    # options of the `SlackAggregatingClient` shared by the process that merges the
+    # messages posted to a channel, e.g. `{'window': 2.0}`, or None to post them one by one
+    aggregation = None
     async_class = AsyncNotifier
 
     @classmethod
     def is_default_delayed(cls):
         return True
 
-    def __new__(cls, *args, **kwargs):
-        is_delayed = kwargs.pop('delayed', False)
-
-        if is_delayed:
-            return cls.async_class(*args, notifier_class=cls, **kwargs)
-        else:
-            return super().__new__(cls)
-
     def __init__(self, timestamp=None):
         self.timestamp = datetime.now() if not timestamp else timestamp
         SlackNotifier.slack_client = SlackLocMemClient()
 
+    @property
+    def client(self):
+        if self.aggregation is None:
+            return SlackNotifier.slack_client
+
+        return SlackAggregatingClient.shared(self.slack_client_class, **self.aggregation)
+
     @property
     @abstractmethod
     def channel(self):
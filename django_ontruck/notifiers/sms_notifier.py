@@ -1,25 +1,26 @@
+import logging
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
 from .notifier import Notifier
+from .rate_limiter import TokenBucket
 from .sms_locmem_client import SmsLocMemClient
 from .async_notifier import AsyncNotifier, MetaDelayedNotifier
 
 
+logger = logging.getLogger(__name__)
+
+
 class SMSNotifier(Notifier, metaclass=MetaDelayedNotifier):
     __slots__ = ('phone_number',)
     async_class = AsyncNotifier
+    lane = 'critical'
 
     @classmethod
     def is_default_delayed(cls):
         return True
 
-    def __new__(cls, *args, **kwargs):
-        is_delayed = kwargs.pop('delayed', False)
-
-        if is_delayed:
-            return cls.async_class(*args, notifier_class=cls, **kwargs)
-        else:
-            return super().__new__(cls)
-
     def __init__(self, phone_number):
         self.phone_number = phone_number
 
@@ -45,3 +46,102 @@ class SMSNotifier(Notifier, metaclass=MetaDelayedNotifier):
         }
 
         return self.client.sms.send(**smsparams)
+
+
+class BulkSMSError(Exception):
+    def __init__(self, failures):
+        self.failures = failures
+
+        super().__init__(f'{len(failures)} SMS deliveries failed: {[error for _, error in failures]}')
+
+
+class BulkSMSNotifier(SMSNotifier):
+    """
+    Sends many `(phone_number, message)` pairs from a single task. Repeated
+    pairs are sent once, and sends are throttled to `rate` messages per
+    second per process. Clients whose `sms` has a `send_batch` get the
+    messages `batch_size` at a time, otherwise they are sent one by one
+    from `max_workers` threads. Every message is attempted and failures
+    are logged. A `BulkSMSError` is only raised when nothing was sent, so
+    retrying never sends a message twice.
+    """
+    __slots__ = ('messages',)
+    lane = 'bulk'
+    rate = 10
+    burst = None
+    batch_size = 100
+    max_workers = 4
+    rate_limiters = {}
+    rate_limiters_lock = Lock()
+
+    def __init__(self, messages):
+        self.messages = messages
+
+    @property
+    def message(self):
+        return None
+
+    @classmethod
+    def rate_limiter(cls):
+        with cls.rate_limiters_lock:
+            if cls not in cls.rate_limiters:
+                cls.rate_limiters[cls] = TokenBucket(cls.rate, capacity=cls.burst)
+
+            return cls.rate_limiters[cls]
+
+    def unique_messages(self):
+        return list(dict.fromkeys((phone_number, message) for phone_number, message in self.messages))
+
+    def smsparams(self, phone_number, message):
+        return {
+            'to': phone_number,
+            'message': message,
+            'from_': self.sender_name,
+        }
+
+    def send_batch(self, client, batch):
+        self.rate_limiter().acquire(len(batch))
+
+        try:
+            return client.sms.send_batch([self.smsparams(*pair) for pair in batch]), None
+        except Exception as error:
+            logger.exception('Cannot send a batch of %s SMS', len(batch))
+
+            return None, error
+
+    def send_one(self, client, pair):
+        self.rate_limiter().acquire()
+
+        try:
+            return client.sms.send(**self.smsparams(*pair)), None
+        except Exception as error:
+            logger.exception('Cannot send SMS to %s', pair[0])
+
+            return None, error
+
+    def send(self):
+        client = self.client
+        messages = self.unique_messages()
+
+        if hasattr(client.sms, 'send_batch'):
+            attempts = [messages[start:start + self.batch_size] for start in range(0, len(messages), self.batch_size)]
+            sent = [self.send_batch(client, batch) for batch in attempts]
+        else:
+            attempts = messages
+
+            if self.max_workers <= 1 or len(messages) <= 1:
+                sent = [self.send_one(client, pair) for pair in messages]
+            else:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    sent = list(executor.map(lambda pair: self.send_one(client, pair), messages))
+
+        failures = [(attempt, error) for attempt, (_, error) in zip(attempts, sent) if error]
+
+        # retrying after a partial failure would send the delivered messages again
+        if failures and len(failures) == len(sent):
+            raise BulkSMSError(failures)
+
+        if failures:
+            logger.warning('%s of %s SMS sends failed', len(failures), len(sent))
+
+        return [response for response, _ in sent]
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from django.core.cache import caches
+
+
+class LocMemTTLCache(object):
+    """
+    A process-local set of keys that expire after a ttl, evicting the least
+    recently added keys when it holds more than `max_size`.
+    """
+
+    def __init__(self, max_size=10000, clock=monotonic):
+        self.max_size = max_size
+        self.clock = clock
+        self.expirations = OrderedDict()
+        self.lock = Lock()
+
+    def add(self, key, ttl):
+        """
+        Adds `key` for `ttl` seconds, returning whether it was missing or
+        expired.
+        """
+        now = self.clock()
+
+        with self.lock:
+            expiration = self.expirations.get(key)
+
+            if expiration is not None and expiration > now:
+                return False
+
+            self.expirations.pop(key, None)
+            self.expirations[key] = now + ttl
+
+            while len(self.expirations) > self.max_size:
+                self.expirations.popitem(last=False)
+
+            return True
+
+    def delete(self, key):
+        with self.lock:
+            self.expirations.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.expirations.clear()
+
+
+class DjangoTTLCache(object):
+    """
+    The same interface as `LocMemTTLCache`, backed by a Django cache so it
+    is shared between processes.
+    """
+
+    def __init__(self, alias='default', prefix='ttl_cache'):
+        self.alias = alias
+        self.prefix = prefix
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, key):
+        return f'{self.prefix}:{key}'
+
+    def add(self, key, ttl):
+        return self.cache.add(self.make_key(key), True, timeout=ttl)
+
+    def delete(self, key):
+        self.cache.delete(self.make_key(key))
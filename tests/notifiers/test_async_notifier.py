@@ -1,9 +1,14 @@
+import sys
+
 import pytest
 from datetime import datetime, timedelta
+from unittest.mock import MagicMock, PropertyMock
 
 from django.contrib.contenttypes.models import ContentType
-from django_ontruck.notifiers.async_notifier import load_class, to_primitives, from_primitives, AsyncNotifier
-from ..test_app.notifiers import DummySlackNotifier
+from django_ontruck.notifiers.async_notifier import load_class, to_primitives, from_primitives, AsyncNotifier, \
+    notifier_batch, notifier_registry
+from ..test_app.models import FooModel
+from ..test_app.notifiers import DummySegmentNotifier, DummySlackNotifier, DummySMSNotifier, DummyAsyncNotifier
 
 
 @pytest.fixture
@@ -33,6 +38,8 @@ def ct_fixtures(foo_model_content_type_id, bar_model_content_type_id, foobar_mod
 @pytest.mark.parametrize('class_path, expected', [
     ('django_ontruck.notifiers.async_notifier.AsyncNotifier', AsyncNotifier),
     ('django_ontruck.notifiers.not_exists', None),
+    ('django_ontruck.not_exists.NotExists', None),
+    ('NotExists', None),
 ])
 def test_load_class(class_path, expected):
     cls = load_class(class_path)
@@ -40,6 +47,22 @@ def test_load_class(class_path, expected):
     assert cls is expected
 
 
+def test_notifier_classes_are_registered():
+    class_path = 'tests.test_app.notifiers.DummySlackNotifier'
+
+    assert notifier_registry[class_path] is DummySlackNotifier
+    assert load_class(class_path) is DummySlackNotifier
+
+
+def test_load_class_imports_missing_modules(mocker):
+    mocker.patch.dict('sys.modules')
+    sys.modules.pop('django_ontruck.notifiers.rate_limiter', None)
+
+    cls = load_class('django_ontruck.notifiers.rate_limiter.TokenBucket')
+
+    assert cls.__name__ == 'TokenBucket'
+
+
 def test_to_primitives_with_primitive_data():
     input_args, input_kwargs = (
         (1, 'sample'),
@@ -110,6 +133,31 @@ def test_from_primitives_with_model_data(ct_fixtures, foo_model, bar_model, foob
     assert output_kwargs == expected_kwargs
 
 
+@pytest.mark.django_db
+def test_from_primitives_loads_each_model_with_one_query(
+    ct_fixtures, foo_model, bar_model, django_assert_num_queries
+):
+    other_foo_model = FooModel.objects.create(title='other')
+    input_args, input_kwargs = (
+        (foo_model.id, other_foo_model.id, bar_model.id),
+        {'key1': foo_model.id,
+         'primitive_keys': {'key1': ct_fixtures['foo_model']},
+         'primitive_indexes': {0: ct_fixtures['foo_model'], 1: ct_fixtures['foo_model'], 2: ct_fixtures['bar_model']}}
+    )
+
+    with django_assert_num_queries(2):
+        output_args, output_kwargs = from_primitives(*input_args, **input_kwargs)
+
+    assert output_args == (foo_model, other_foo_model, bar_model)
+    assert output_kwargs == {'key1': foo_model}
+
+
+@pytest.mark.django_db
+def test_from_primitives_with_missing_objects(ct_fixtures, foo_model):
+    with pytest.raises(FooModel.DoesNotExist):
+        from_primitives(foo_model.id + 1, primitive_indexes={0: ct_fixtures['foo_model']})
+
+
 @pytest.mark.django_db
 def test_idempotence(foo_model, bar_model, foobar_model):
     input_args, input_kwargs = (
@@ -154,3 +202,98 @@ def test_async_notifier_with_celery_opts(foo_model, celery_opts, expected_key):
         foo_model_id=foo_model.id,
         primitive_keys=['foo_model_id'],
     )
+
+
+@pytest.fixture
+def celery_task(mocker):
+    task = MagicMock()
+    mocker.patch.object(DummyAsyncNotifier, 'client', new_callable=PropertyMock, return_value=task)
+    return task
+
+
+def test_notifier_batch_publishes_on_exit(celery_task):
+    signature = celery_task.s.return_value
+    producer = signature.app.producer_or_acquire.return_value.__enter__.return_value
+
+    with notifier_batch():
+        DummySlackNotifier().send()
+        DummySlackNotifier().send()
+
+        assert not signature.apply_async.called
+
+    assert signature.app.producer_or_acquire.call_count == 1
+    assert signature.apply_async.call_count == 2
+    signature.apply_async.assert_called_with(producer=producer, queue=AsyncNotifier.default_queue,
+                                             shadow=DummySlackNotifier.__module__ + '.DummySlackNotifier')
+
+
+def test_nested_notifier_batches_publish_with_the_outermost(celery_task):
+    signature = celery_task.s.return_value
+
+    with notifier_batch():
+        with notifier_batch():
+            DummySlackNotifier().send()
+
+        assert not signature.apply_async.called
+
+    assert signature.apply_async.call_count == 1
+
+
+def test_notifier_batch_does_not_publish_on_errors(celery_task):
+    signature = celery_task.s.return_value
+
+    with pytest.raises(ValueError):
+        with notifier_batch():
+            DummySlackNotifier().send()
+            raise ValueError()
+
+    assert not signature.apply_async.called
+
+
+class CountingSegmentNotifier(DummySegmentNotifier):
+    inits = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingSegmentNotifier.inits += 1
+        super().__init__(*args, **kwargs)
+
+
+@pytest.mark.parametrize('delayed, inits', [(True, 0), (False, 1)])
+def test_notifiers_are_built_once(mocker, delayed, inits):
+    mocker.patch.object(CountingSegmentNotifier, 'inits', 0)
+
+    notifier = CountingSegmentNotifier(user=None, delayed=delayed)
+
+    assert isinstance(notifier, AsyncNotifier) is delayed
+    assert CountingSegmentNotifier.inits == inits
+
+
+def test_delayed_notifiers_keep_their_creation_timestamp():
+    timestamp = datetime(2021, 1, 1)
+
+    assert DummySegmentNotifier(user=None).notifier_kwargs['timestamp'] <= datetime.now()
+    assert DummySegmentNotifier(user=None, timestamp=timestamp).notifier_kwargs['timestamp'] == timestamp
+
+
+def test_notifier_lanes_default_to_the_notifications_queue(celery_task):
+    DummySMSNotifier(phone_number='123').send()
+
+    celery_task.s.return_value.apply_async.assert_called_once_with(
+        queue=AsyncNotifier.default_queue, shadow=DummySMSNotifier.__module__ + '.DummySMSNotifier'
+    )
+
+
+def test_notifier_lanes_are_routed_by_settings(celery_task, settings):
+    settings.NOTIFIER_LANES = {
+        'critical': {'queue': 'celery.notifications.critical', 'priority': 9},
+        'bulk': {'queue': 'celery.notifications.bulk'},
+    }
+
+    DummySMSNotifier(phone_number='123').send()
+    DummySegmentNotifier(user=None).send()
+    DummySlackNotifier().send()
+
+    assert [call.kwargs['queue'] for call in celery_task.s.return_value.apply_async.call_args_list] == [
+        'celery.notifications.critical', 'celery.notifications.bulk', AsyncNotifier.default_queue,
+    ]
+    assert celery_task.s.return_value.apply_async.call_args_list[0].kwargs['priority'] == 9
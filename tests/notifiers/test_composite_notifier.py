@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import MagicMock, PropertyMock
+
+from django_ontruck.notifiers import AsyncNotifier, Notifier
+from django_ontruck.notifiers.composite_notifier import CompositeNotifierError
+from ..test_app.notifiers import DummyAsyncNotifier, DummyCompositeNotifier, DummySegmentNotifier, \
+    DummySlackNotifier, DummySMSNotifier
+
+
+@pytest.mark.django_db
+def test_composite_async_notifier(foo_model):
+    notifier = DummyCompositeNotifier(foo_model)
+    assert isinstance(notifier, AsyncNotifier)
+
+    notifier.send()
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_composite_notifier_sends_every_channel(mocker, max_workers):
+    slack_send = mocker.patch.object(DummySlackNotifier, 'send', return_value='slack')
+    segment_send = mocker.patch.object(DummySegmentNotifier, 'send', return_value='segment')
+    notifier = DummyCompositeNotifier(None, delayed=False)
+    notifier.max_workers = max_workers
+    assert isinstance(notifier, Notifier)
+
+    results = notifier.send()
+
+    assert [result.response for result in results] == ['slack', 'segment']
+    slack_send.assert_called_once()
+    segment_send.assert_called_once()
+
+
+def test_composite_notifier_isolates_channel_errors(mocker):
+    mocker.patch.object(DummySlackNotifier, 'send', side_effect=ValueError())
+    segment_send = mocker.patch.object(DummySegmentNotifier, 'send')
+
+    results = DummyCompositeNotifier(None, delayed=False).send()
+
+    assert [bool(result.error) for result in results] == [True, False]
+    segment_send.assert_called_once()
+
+
+def test_composite_notifier_raises_when_every_channel_fails(mocker):
+    mocker.patch.object(DummySlackNotifier, 'send', side_effect=ValueError())
+    mocker.patch.object(DummySegmentNotifier, 'send', side_effect=ValueError())
+
+    with pytest.raises(CompositeNotifierError) as error:
+        DummyCompositeNotifier(None, delayed=False).send()
+
+    assert [bool(result.error) for result in error.value.results] == [True, True]
+
+
+class DummyCriticalCompositeNotifier(DummyCompositeNotifier):
+    notifier_classes = (DummySegmentNotifier, DummySMSNotifier)
+
+
+def test_composite_notifier_takes_the_highest_priority_lane():
+    assert DummyCompositeNotifier.lane == 'default'
+    assert DummyCriticalCompositeNotifier.lane == 'critical'
+
+
+def test_composite_notifier_is_routed_through_its_lane(mocker, settings):
+    task = MagicMock()
+    mocker.patch.object(DummyAsyncNotifier, 'client', new_callable=PropertyMock, return_value=task)
+    settings.NOTIFIER_LANES = {'critical': {'queue': 'celery.notifications.critical'}}
+
+    DummyCriticalCompositeNotifier('123').send()
+
+    assert task.s.return_value.apply_async.call_args.kwargs['queue'] == 'celery.notifications.critical'
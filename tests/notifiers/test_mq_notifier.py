@@ -1,5 +1,10 @@
-from django_ontruck.notifiers import AsyncNotifier, Notifier
-from ..test_app.notifiers import DummyMQNotifier, DummyMQWithMessageNotifier, DummyMQWithInvalidMessageNotifier
+import json
+
+from kombu import Connection, Exchange, Queue
+
+from django_ontruck.notifiers import AsyncNotifier, MQKombuClient, Notifier
+from ..test_app.notifiers import DummyMQNotifier, DummyMQWithMessageNotifier, DummyMQWithInvalidMessageNotifier, \
+    DummyMQKombuNotifier
 
 
 def test_mq_notifier(mocker):
@@ -28,3 +33,57 @@ def test_mq_with_invalid_message_notifier(mocker):
     assert isinstance(notifier, Notifier)
 
     notifier.send()
+
+
+def test_mq_kombu_notifier():
+    DummyMQKombuNotifier(queue_name='kombu_test', exchange_name='kombu_test', delayed=False).send()
+    DummyMQKombuNotifier(queue_name='kombu_test', exchange_name='kombu_test', delayed=False).send()
+
+    queue = Queue('kombu_test', Exchange('kombu_test', type='direct'), routing_key='kombu_test')
+
+    with Connection('memory://') as connection:
+        with connection.SimpleQueue(queue) as simple_queue:
+            messages = [simple_queue.get(timeout=1) for _ in range(2)]
+
+    assert [json.loads(message.body) for message in messages] == [{'body': 'sample message'}] * 2
+
+
+def test_mq_kombu_client_caches_channels():
+    notifier = DummyMQKombuNotifier(queue_name='kombu_test', delayed=False)
+
+    assert notifier.channel is notifier.channel
+
+
+def test_mq_kombu_client_caches_channels_per_queue():
+    notifier = DummyMQKombuNotifier(queue_name='kombu_test', routing_key='shared', delayed=False)
+    other = DummyMQKombuNotifier(queue_name='kombu_other', routing_key='shared', delayed=False)
+
+    assert notifier.channel is not other.channel
+    assert other.channel.queue.name == 'kombu_other'
+
+
+def test_mq_kombu_client_declares_exchanges_of_its_type():
+    client = MQKombuClient('memory://', exchange_type='topic')
+    channel = client.make_channel('kombu_topic', 'kombu_topic', 'loads.*')
+    queue = Queue('kombu_topic', Exchange('kombu_topic', type='topic'), routing_key='loads.*')
+
+    channel.basic_publish(routing_key='loads.assigned', body=json.dumps({'body': 'assigned'}))
+
+    with Connection('memory://') as connection:
+        with connection.SimpleQueue(queue) as simple_queue:
+            message = simple_queue.get(timeout=1)
+
+    assert channel.exchange.type == 'topic'
+    assert json.loads(message.body) == {'body': 'assigned'}
+
+
+def test_mq_kombu_channel_publishes_to_the_given_exchange():
+    channel = MQKombuClient.for_url('memory://').make_channel('kombu_test', 'kombu_test', 'kombu_test')
+    queue = Queue('kombu_given', Exchange('kombu_given', type='direct'), routing_key='kombu_given')
+
+    with Connection('memory://') as connection:
+        with connection.SimpleQueue(queue) as simple_queue:
+            channel.basic_publish(exchange='kombu_given', routing_key='kombu_given', body=json.dumps({}))
+            message = simple_queue.get(timeout=1)
+
+    assert json.loads(message.body) == {}
@@ -0,0 +1,59 @@
+import pytest
+
+from django_ontruck.notifiers.ttl_cache import LocMemTTLCache
+from ..test_app.notifiers import DummySMSNotifier
+
+
+class IdempotentSMSNotifier(DummySMSNotifier):
+    idempotency_store = LocMemTTLCache()
+    sends = 0
+
+    def send(self):
+        IdempotentSMSNotifier.sends += 1
+
+        return super().send()
+
+
+@pytest.fixture
+def idempotent_notifier(mocker):
+    mocker.patch.object(IdempotentSMSNotifier, 'sends', 0)
+    IdempotentSMSNotifier.idempotency_store.clear()
+    yield IdempotentSMSNotifier
+
+
+def test_notifier_skips_duplicated_sends(idempotent_notifier, mocker):
+    send = mocker.patch('django_ontruck.notifiers.sms_locmem_client.SmsLocMemClient.Sms.send')
+
+    idempotent_notifier(phone_number='123', delayed=False).send()
+    idempotent_notifier(phone_number='123', delayed=False).send()
+    idempotent_notifier(phone_number='456', delayed=False).send()
+
+    assert idempotent_notifier.sends == 2
+    assert send.call_count == 2
+
+
+def test_notifier_releases_the_key_of_failed_sends(idempotent_notifier, mocker):
+    mocker.patch.object(DummySMSNotifier, 'send', side_effect=[ValueError(), None])
+
+    with pytest.raises(ValueError):
+        idempotent_notifier(phone_number='123', delayed=False).send()
+    idempotent_notifier(phone_number='123', delayed=False).send()
+
+    assert idempotent_notifier.sends == 2
+
+
+@pytest.mark.django_db
+def test_notifier_idempotency_key_uses_model_primary_keys(foo_model):
+    key = DummySMSNotifier(foo_model, delayed=False).idempotency_key()
+
+    assert key == DummySMSNotifier(foo_model.__class__.objects.get(), delayed=False).idempotency_key()
+    assert key.startswith('notifier:tests.test_app.notifiers.DummySMSNotifier:')
+
+
+def test_notifier_without_idempotency_store_always_sends(mocker):
+    send = mocker.patch('django_ontruck.notifiers.sms_locmem_client.SmsLocMemClient.Sms.send')
+
+    DummySMSNotifier(phone_number='123', delayed=False).send()
+    DummySMSNotifier(phone_number='123', delayed=False).send()
+
+    assert send.call_count == 2
@@ -1,5 +1,12 @@
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
 from django_ontruck.notifiers import AsyncNotifier, Notifier
-from ..test_app.notifiers import DummyPushNotifier
+from django_ontruck.notifiers.push import Device
+from django_ontruck.notifiers.push_notifier import PushDispatchError
+from ..test_app.notifiers import DummyMessage, DummyPushNotifier
 
 
 def test_push_notifier(mocker):
@@ -14,3 +21,111 @@ def test_push_async_notifier(mocker):
     assert isinstance(notifier, AsyncNotifier)
 
     notifier.send()
+
+
+class DummyWebPushNotifier(DummyPushNotifier):
+    chunk_size = 2
+    web_devices = []
+
+    def is_available_for_device_type(self, device_type):
+        return device_type in (Device.WEB, Device.ANDROID)
+
+    def devices(self, device_provider):
+        if device_provider == Device.WEB:
+            return self.web_devices
+
+        return super().devices(device_provider)
+
+    def provider_class_for(self, device_type):
+        return device_type
+
+
+@pytest.fixture
+def web_devices():
+    DummyWebPushNotifier.web_devices = [MagicMock() for _ in range(3)]
+    yield DummyWebPushNotifier.web_devices
+    DummyWebPushNotifier.web_devices = []
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_push_notifier_sends_in_chunks(web_devices, max_workers):
+    notifier = DummyWebPushNotifier(delayed=False)
+    notifier.max_workers = max_workers
+
+    results = notifier.send()
+
+    assert [result.device_type for result in results] == [Device.ANDROID, Device.WEB, Device.WEB]
+    assert [result.devices for result in results[1:]] == [web_devices[:2], web_devices[2:]]
+    for device in web_devices:
+        device.send_message.assert_called_once()
+
+
+def test_push_notifier_serialises_web_message_once(web_devices):
+    DummyWebPushNotifier(delayed=False).send()
+
+    payloads = [device.send_message.call_args[0][0] for device in web_devices]
+    assert json.loads(payloads[0]) == {'message': None, 'extra': {}}
+    assert all(payload is payloads[0] for payload in payloads)
+
+
+def test_message_builds_payload_once(mocker):
+    extra = mocker.patch.object(DummyMessage, 'extra', new_callable=mocker.PropertyMock, return_value={'id': 1})
+    message = DummyMessage(device_type=Device.ANDROID, category=None, message='hello')
+
+    assert message.to_dict() == {'message': 'hello', 'extra': {'id': 1}, 'use_fcm_notifications': False}
+    assert message.to_json() is message.to_json()
+    extra.assert_called_once()
+
+
+def test_push_notifier_isolates_chunk_errors(web_devices):
+    web_devices[0].send_message.side_effect = ValueError()
+
+    results = DummyWebPushNotifier(delayed=False).send()
+
+    assert [bool(result.error) for result in results] == [False, False, False]
+    assert results[1].response == [web_devices[1]]
+    assert [device for device, _ in results[1].failures] == [web_devices[0]]
+    web_devices[2].send_message.assert_called_once()
+
+
+def test_push_notifier_reports_undelivered_web_chunks(web_devices):
+    web_devices[0].send_message.side_effect = ValueError()
+    web_devices[1].send_message.side_effect = ValueError()
+
+    results = DummyWebPushNotifier(delayed=False).send()
+
+    assert [bool(result.error) for result in results] == [False, True, False]
+    assert [device for device, _ in results[1].error.failures] == web_devices[:2]
+
+
+def test_push_notifier_raises_when_no_chunk_is_delivered(web_devices, mocker):
+    for device in web_devices:
+        device.send_message.side_effect = ValueError()
+    notifier = DummyWebPushNotifier(delayed=False)
+    mocker.patch.object(
+        notifier, 'is_available_for_device_type', side_effect=lambda device_type: device_type == Device.WEB
+    )
+
+    with pytest.raises(PushDispatchError) as error:
+        notifier.send()
+
+    assert [bool(result.error) for result in error.value.results] == [True, True]
+
+
+class ExpiredSubscription(Exception):
+    def __init__(self):
+        self.response = MagicMock(status_code=410)
+
+
+@pytest.mark.parametrize('web_max_in_flight', [1, 3])
+def test_push_notifier_prunes_expired_web_devices(web_devices, mocker, web_max_in_flight):
+    web_devices[1].send_message.side_effect = ExpiredSubscription()
+    notifier = DummyWebPushNotifier(delayed=False)
+    notifier.chunk_size = None
+    notifier.web_max_in_flight = web_max_in_flight
+    prune_web_devices = mocker.patch.object(notifier, 'prune_web_devices')
+
+    results = notifier.send()
+
+    prune_web_devices.assert_called_once_with([web_devices[1]])
+    assert results[-1].response == [web_devices[0], web_devices[2]]
@@ -0,0 +1,38 @@
+from django_ontruck.notifiers.rate_limiter import TokenBucket
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_allows_bursts_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(2, capacity=3, clock=clock, sleep=clock.sleep)
+
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.acquire() == 0.5
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(2, clock=clock, sleep=clock.sleep)
+
+    bucket.acquire(2)
+    clock.now += 1
+
+    assert bucket.acquire(2) == 0
+
+
+def test_token_bucket_reserves_more_tokens_than_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(2, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire(6) == 2
+    assert clock.now == 2
@@ -1,6 +1,8 @@
 import pytest
+from datetime import datetime
 from unittest.mock import MagicMock
-from django_ontruck.notifiers import AsyncNotifier, Notifier
+from django_ontruck import notifiers
+from django_ontruck.notifiers import AsyncNotifier, Notifier, SegmentBufferedClient, SegmentNotifier
 from ..test_app.notifiers import DummySegmentNotifier, DummySegmentWithIdentityNotifier
 
 
@@ -30,3 +32,150 @@ def test_segment_with_identity_notifier(mocker, mock_user):
     assert isinstance(notifier, Notifier)
 
     notifier.send()
+
+
+@pytest.fixture
+def identify_cache():
+    SegmentNotifier.identify_cache.clear()
+    yield SegmentNotifier.identify_cache
+    SegmentNotifier.identify_cache.clear()
+
+
+def test_segment_identical_identify_calls_are_skipped(mock_user, identify_cache):
+    DummySegmentWithIdentityNotifier(user=mock_user, delayed=False).send()
+    identified = len(notifiers.segment_outbox_identify)
+    tracked = len(notifiers.segment_outbox_track)
+
+    DummySegmentWithIdentityNotifier(user=mock_user, delayed=False).send()
+
+    assert len(notifiers.segment_outbox_identify) == identified
+    assert len(notifiers.segment_outbox_track) == tracked + 1
+
+
+def test_segment_failed_identify_calls_are_sent_again(mock_user, identify_cache, mocker):
+    notifier = DummySegmentWithIdentityNotifier(user=mock_user, delayed=False)
+    identify = mocker.patch.object(notifier.client, 'identify', side_effect=[OSError(), None])
+
+    with pytest.raises(OSError):
+        notifier.send()
+    DummySegmentWithIdentityNotifier(user=mock_user, delayed=False).send()
+
+    assert identify.call_count == 2
+
+
+def test_segment_identify_properties_are_built_once(mock_user, identify_cache, mocker):
+    identify_properties = mocker.patch.object(
+        DummySegmentWithIdentityNotifier, 'identify_properties', new_callable=mocker.PropertyMock,
+        return_value={'uuid': 123},
+    )
+    notifier = DummySegmentWithIdentityNotifier(user=mock_user, delayed=False)
+    mocker.patch.object(notifier.client, 'identify', side_effect=OSError())
+
+    with pytest.raises(OSError):
+        notifier.send()
+
+    identify_properties.assert_called_once()
+
+
+def test_segment_identify_calls_of_other_users_are_sent(mock_user, identify_cache):
+    DummySegmentWithIdentityNotifier(user=mock_user, delayed=False).send()
+    identified = len(notifiers.segment_outbox_identify)
+
+    other_user = MagicMock()
+    other_user.uuid = 'other_uuid'
+    DummySegmentWithIdentityNotifier(user=other_user, delayed=False).send()
+
+    assert len(notifiers.segment_outbox_identify) == identified + 1
+
+
+def test_segment_clients_are_pooled(mock_user):
+    first = DummySegmentNotifier(user=mock_user, delayed=False)
+    second = DummySegmentWithIdentityNotifier(user=mock_user, delayed=False)
+
+    assert first.client is second.client
+
+
+class DummyBufferedSegmentNotifier(DummySegmentNotifier):
+    client_class = SegmentBufferedClient
+
+
+def test_segment_clients_are_pooled_per_client_class(mock_user):
+    locmem = DummySegmentNotifier(user=mock_user, delayed=False)
+    buffered = DummyBufferedSegmentNotifier(user=mock_user, delayed=False)
+
+    assert isinstance(buffered.client, SegmentBufferedClient)
+    assert buffered.client is not locmem.client
+    SegmentNotifier.client_pool.pop((SegmentBufferedClient, buffered.segment_key))
+
+
+@pytest.fixture
+def upload():
+    return MagicMock()
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def buffered_client(upload, clock):
+    return SegmentBufferedClient('key', upload=upload, max_batch_size=2, flush_interval=None, clock=clock)
+
+
+def test_segment_buffered_client_uploads_full_batches(buffered_client, upload):
+    timestamp = datetime(2021, 1, 1)
+
+    buffered_client.identify('uuid', {'name': 'foo'})
+    assert not upload.called
+
+    buffered_client.track('uuid', 'test_event', timestamp=timestamp, properties={'foo': 'bar'})
+
+    upload.assert_called_once_with([
+        {'type': 'identify', 'userId': 'uuid', 'traits': {'name': 'foo'}},
+        {'type': 'track', 'userId': 'uuid', 'event': 'test_event', 'timestamp': timestamp.isoformat(),
+         'properties': {'foo': 'bar'}},
+    ])
+
+
+def test_segment_buffered_client_flushes_pending_messages(buffered_client, upload):
+    buffered_client.identify('uuid')
+    buffered_client.shutdown()
+
+    upload.assert_called_once_with([{'type': 'identify', 'userId': 'uuid', 'traits': {}}])
+
+
+def test_segment_buffered_client_retries_failed_uploads(buffered_client, upload, clock):
+    upload.side_effect = [OSError(), None]
+
+    buffered_client.identify('uuid')
+    buffered_client.flush()
+    buffered_client.flush()
+    assert upload.call_count == 1
+
+    clock.now = 1
+    buffered_client.flush()
+
+    assert upload.call_count == 2
+    assert buffered_client.failed == []
+
+
+def test_segment_buffered_client_drops_batches_after_max_retries(buffered_client, upload, clock):
+    upload.side_effect = OSError()
+
+    buffered_client.identify('uuid')
+
+    for now in (0, 1, 3, 7):
+        clock.now = now
+        buffered_client.flush()
+
+    assert upload.call_count == 4
+    assert buffered_client.failed == []
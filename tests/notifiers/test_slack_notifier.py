@@ -1,4 +1,8 @@
-from django_ontruck.notifiers import AsyncNotifier, Notifier
+import pytest
+from unittest.mock import MagicMock
+
+from django_ontruck import notifiers
+from django_ontruck.notifiers import AsyncNotifier, Notifier, SlackAggregatingClient, SlackLocMemClient, SlackNotifier
 from ..test_app.notifiers import DummySlackNotifier
 
 
@@ -14,3 +18,155 @@ def test_slack_async_notifier(mocker):
     assert isinstance(notifier, AsyncNotifier)
 
     notifier.send()
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after):
+        self.response = MagicMock(status_code=429, headers={'Retry-After': str(retry_after)})
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def slack_client():
+    client = SlackLocMemClient()
+    notifiers.slack_outbox_chat_master.clear()
+    yield client
+    notifiers.slack_outbox_chat_master.clear()
+
+
+@pytest.fixture
+def aggregating_client(slack_client, clock):
+    return SlackAggregatingClient(slack_client, window=1, min_interval=1, poll_interval=None, clock=clock)
+
+
+def posted():
+    return [(post['args'][0], post['args'][1]) for post in notifiers.slack_outbox_chat_master]
+
+
+def test_slack_aggregating_client_merges_messages_per_channel(aggregating_client, clock):
+    aggregating_client.chat.post_message('ops', 'first')
+    aggregating_client.chat.post_message('ops', 'second')
+    aggregating_client.chat.post_message('sales', 'third')
+
+    aggregating_client.flush(force=False)
+    assert posted() == []
+
+    clock.now = 1
+    aggregating_client.flush(force=False)
+    assert posted() == [('ops', 'first\nsecond'), ('sales', 'third')]
+
+
+def test_slack_aggregating_client_keeps_messages_with_other_options_apart(aggregating_client):
+    aggregating_client.chat.post_message('ops', 'first', link_names=True)
+    aggregating_client.chat.post_message('ops', 'second', attachments=[{}])
+
+    aggregating_client.flush(force=False)
+    assert posted() == []
+
+    aggregating_client.shutdown()
+    assert posted() == [('ops', 'first'), ('ops', 'second')]
+
+
+def test_slack_aggregating_client_honours_retry_after(aggregating_client, slack_client, clock, mocker):
+    post_message = mocker.patch.object(slack_client.chat, 'post_message', side_effect=[RateLimited(30), None])
+    aggregating_client.chat.post_message('ops', 'first')
+
+    aggregating_client.flush()
+    clock.now = 29
+    aggregating_client.flush()
+    assert post_message.call_count == 1
+
+    clock.now = 30
+    aggregating_client.flush()
+    assert post_message.call_count == 2
+    assert post_message.call_args.args == ('ops', 'first')
+
+
+def test_slack_aggregating_client_posts_replies_in_a_thread(aggregating_client, slack_client, mocker):
+    post_message = mocker.patch.object(slack_client.chat, 'post_message', return_value={'ts': '1.0'})
+    aggregating_client.thread_replies = True
+
+    for text in ('first', 'second', 'third'):
+        aggregating_client.chat.post_message('ops', text)
+    aggregating_client.flush()
+
+    assert post_message.call_args_list == [
+        mocker.call('ops', 'first'),
+        mocker.call('ops', 'second\nthird', thread_ts='1.0'),
+    ]
+
+
+def test_slack_notifier_with_aggregating_client(aggregating_client, mocker):
+    mocker.patch.object(
+        DummySlackNotifier, 'client', new_callable=mocker.PropertyMock, return_value=aggregating_client
+    )
+
+    DummySlackNotifier(delayed=False).send()
+    DummySlackNotifier(delayed=False).send()
+    aggregating_client.shutdown()
+
+    assert posted() == [('sample-channel', 'test message\ntest message')]
+
+
+class DummyAggregatedSlackNotifier(DummySlackNotifier):
+    aggregation = {'poll_interval': None}
+    client = SlackNotifier.client
+
+
+@pytest.fixture
+def shared_clients():
+    SlackAggregatingClient.shared_clients.clear()
+    yield SlackAggregatingClient.shared_clients
+    SlackAggregatingClient.shared_clients.clear()
+
+
+def test_slack_aggregating_clients_are_shared_per_options(shared_clients):
+    client = SlackAggregatingClient.shared(SlackLocMemClient, window=2)
+
+    assert SlackAggregatingClient.shared(SlackLocMemClient, window=2) is client
+    assert SlackAggregatingClient.shared(SlackLocMemClient, window=3) is not client
+    assert client.window == 2
+
+
+def test_slack_notifier_posts_through_the_shared_aggregating_client(slack_client, shared_clients):
+    DummyAggregatedSlackNotifier(delayed=False).send()
+    DummyAggregatedSlackNotifier(delayed=False).send()
+
+    assert posted() == []
+
+    SlackAggregatingClient.shutdown_clients()
+
+    assert posted() == [('sample-channel', 'test message\ntest message')]
+
+
+def test_slack_aggregating_client_does_not_repost_the_parent_of_a_thread(aggregating_client, slack_client, mocker):
+    post_message = mocker.patch.object(slack_client.chat, 'post_message', return_value={})
+    aggregating_client.thread_replies = True
+
+    for text in ('one', 'two'):
+        aggregating_client.chat.post_message('ops', text)
+    aggregating_client.flush()
+
+    assert [call.args[1] for call in post_message.call_args_list] == ['one', 'two']
+
+
+def test_slack_aggregating_client_shutdown_stops_on_rate_limits(aggregating_client, slack_client, mocker):
+    post_message = mocker.patch.object(slack_client.chat, 'post_message', side_effect=RateLimited(0))
+    aggregating_client.chat.post_message('ops', 'first')
+
+    aggregating_client.shutdown()
+
+    assert post_message.call_count == 1
+    assert aggregating_client.buffers['ops'][0][1] == 'first'
@@ -1,5 +1,9 @@
+import pytest
+from unittest.mock import MagicMock, PropertyMock, patch
+
 from django_ontruck.notifiers import AsyncNotifier, Notifier
-from ..test_app.notifiers import DummySMSNotifier
+from django_ontruck.notifiers.sms_notifier import BulkSMSError
+from ..test_app.notifiers import DummyBulkSMSNotifier, DummySMSNotifier
 
 
 def test_sms_notifier(mocker):
@@ -14,3 +18,60 @@ def test_sms_async_notifier(mocker):
     assert isinstance(notifier, AsyncNotifier)
 
     notifier.send()
+
+
+def test_bulk_sms_async_notifier():
+    notifier = DummyBulkSMSNotifier(messages=[('123', 'hello')])
+    assert isinstance(notifier, AsyncNotifier)
+
+    notifier.send()
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_bulk_sms_notifier_deduplicates_messages(max_workers):
+    client = MagicMock(spec=['sms'])
+    client.sms = MagicMock(spec=['send'])
+    notifier = DummyBulkSMSNotifier(messages=[['123', 'hello'], ['456', 'hello'], ['123', 'hello']], delayed=False)
+    notifier.max_workers = max_workers
+
+    with patch.object(DummyBulkSMSNotifier, 'client', new_callable=PropertyMock, return_value=client):
+        notifier.send()
+
+    assert sorted(call.kwargs['to'] for call in client.sms.send.call_args_list) == ['123', '456']
+
+
+def test_bulk_sms_notifier_uses_batch_endpoint():
+    client = MagicMock()
+    notifier = DummyBulkSMSNotifier(messages=[('1', 'a'), ('2', 'b'), ('3', 'c')], delayed=False)
+    notifier.batch_size = 2
+
+    with patch.object(DummyBulkSMSNotifier, 'client', new_callable=PropertyMock, return_value=client):
+        notifier.send()
+
+    assert [len(call.args[0]) for call in client.sms.send_batch.call_args_list] == [2, 1]
+    client.sms.send.assert_not_called()
+
+
+def test_bulk_sms_notifier_does_not_raise_partial_failures():
+    client = MagicMock(spec=['sms'])
+    client.sms = MagicMock(spec=['send'], **{'send.side_effect': [ValueError(), 'ok']})
+    notifier = DummyBulkSMSNotifier(messages=[('1', 'a'), ('2', 'b')], delayed=False)
+    notifier.max_workers = 1
+
+    with patch.object(DummyBulkSMSNotifier, 'client', new_callable=PropertyMock, return_value=client):
+        assert notifier.send() == [None, 'ok']
+
+    assert client.sms.send.call_count == 2
+
+
+def test_bulk_sms_notifier_raises_when_nothing_was_sent():
+    client = MagicMock()
+    client.sms.send_batch.side_effect = ValueError()
+    notifier = DummyBulkSMSNotifier(messages=[('1', 'a'), ('2', 'b')], delayed=False)
+    notifier.batch_size = 1
+
+    with patch.object(DummyBulkSMSNotifier, 'client', new_callable=PropertyMock, return_value=client):
+        with pytest.raises(BulkSMSError) as error:
+            notifier.send()
+
+    assert [batch for batch, _ in error.value.failures] == [[('1', 'a')], [('2', 'b')]]
@@ -0,0 +1,50 @@
+import pytest
+
+from django_ontruck.notifiers.ttl_cache import LocMemTTLCache, DjangoTTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(clock):
+    return LocMemTTLCache(max_size=2, clock=clock)
+
+
+def test_locmem_ttl_cache_adds_missing_keys_only(cache):
+    assert cache.add('foo', ttl=10)
+    assert not cache.add('foo', ttl=10)
+
+
+def test_locmem_ttl_cache_expires_keys(cache, clock):
+    cache.add('foo', ttl=10)
+    clock.now = 10
+
+    assert cache.add('foo', ttl=10)
+
+
+def test_locmem_ttl_cache_evicts_the_oldest_keys(cache):
+    cache.add('foo', ttl=10)
+    cache.add('bar', ttl=10)
+    cache.add('baz', ttl=10)
+
+    assert cache.add('foo', ttl=10)
+    assert not cache.add('baz', ttl=10)
+
+
+def test_django_ttl_cache_adds_missing_keys_only():
+    cache = DjangoTTLCache(prefix='test_ttl_cache')
+    cache.delete('foo')
+
+    assert cache.add('foo', ttl=10)
+    assert not cache.add('foo', ttl=10)
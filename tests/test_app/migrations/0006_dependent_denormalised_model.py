@@ -0,0 +1,53 @@
+# Generated by Django 2.2.13 on 2026-10-18 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('test_app', '0005_denormalised_model'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DependentDenormalisedModel',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, null=True)),
+                ('modified_at', models.DateTimeField(auto_now=True, null=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('quantity', models.IntegerField(default=0)),
+                ('name', models.CharField(blank=True, max_length=50)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='test_app_dependentdenormalisedmodel_created_set', to=settings.AUTH_USER_MODEL)),
+                ('deleted_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='test_app_dependentdenormalisedmodel_deleted_set', to=settings.AUTH_USER_MODEL)),
+                ('modified_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='test_app_dependentdenormalisedmodel_modified_set', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='DependentDenormalisedModelCalculatedFields',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, null=True)),
+                ('modified_at', models.DateTimeField(auto_now=True, null=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('double_quantity', models.IntegerField(default=0)),
+                ('upper_name', models.CharField(blank=True, max_length=50)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='test_app_dependentdenormalisedmodelcalculatedfields_created_set', to=settings.AUTH_USER_MODEL)),
+                ('deleted_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='test_app_dependentdenormalisedmodelcalculatedfields_deleted_set', to=settings.AUTH_USER_MODEL)),
+                ('modified_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='test_app_dependentdenormalisedmodelcalculatedfields_modified_set', to=settings.AUTH_USER_MODEL)),
+                ('parent', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='_denormalised_calculated_fields', to='test_app.DependentDenormalisedModel')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 2.2.13 on 2026-10-18 11:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('test_app', '0006_dependent_denormalised_model'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LazyDenormalisedModel',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, null=True)),
+                ('modified_at', models.DateTimeField(auto_now=True, null=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='test_app_lazydenormalisedmodel_created_set', to=settings.AUTH_USER_MODEL)),
+                ('deleted_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='test_app_lazydenormalisedmodel_deleted_set', to=settings.AUTH_USER_MODEL)),
+                ('modified_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='test_app_lazydenormalisedmodel_modified_set', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='LazyDenormalisedModelCalculatedFields',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, null=True)),
+                ('modified_at', models.DateTimeField(auto_now=True, null=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('bar', models.CharField(max_length=100)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='test_app_lazydenormalisedmodelcalculatedfields_created_set', to=settings.AUTH_USER_MODEL)),
+                ('deleted_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='test_app_lazydenormalisedmodelcalculatedfields_deleted_set', to=settings.AUTH_USER_MODEL)),
+                ('modified_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='test_app_lazydenormalisedmodelcalculatedfields_modified_set', to=settings.AUTH_USER_MODEL)),
+                ('parent', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='_denormalised_calculated_fields', to='test_app.LazyDenormalisedModel')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
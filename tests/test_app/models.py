@@ -1,8 +1,9 @@
 from django.db import models
 from django.db.models import QuerySet
+from django.db.models.signals import post_save
 
 from django_ontruck.denormalisation import (
-    Denormalised, SignalListener, EventListener, sync_handler
+    Denormalised, DenormalisedQuerySet, SignalListener, EventListener, sync_handler, saved_changes
 )
 from django_ontruck.models import BaseModel
 from django_ontruck.managers import BaseManager
@@ -34,6 +35,8 @@ def lookup_denormalised_model_by_id(instance_id, **_kwargs):
 
 
 class DenormalisedModel(BaseModel):
+    objects = DenormalisedQuerySet.as_manager()
+
     calculated_fields = Denormalised(
         BaseModel,
         listeners=(
@@ -68,3 +71,47 @@ class DenormalisedModel(BaseModel):
 
 class DefaultDenormalisedModel(BaseModel):
     calculated_fields = Denormalised()
+
+
+class DependentDenormalisedModel(BaseModel):
+    quantity = models.IntegerField(default=0)
+    name = models.CharField(max_length=50, blank=True)
+
+    calculated_fields = Denormalised(
+        BaseModel,
+        listeners=(
+            SignalListener(
+                post_save,
+                sender='test_app.DependentDenormalisedModel',
+                changed=saved_changes,
+            ),
+        ),
+        track_changes=True,
+        handler=sync_handler,
+    )
+
+    @calculated_fields.property(
+        models.IntegerField(default=0),
+        depends_on=('quantity',)
+    )
+    def double_quantity(self):
+        return self.quantity * 2
+
+    @calculated_fields.property(
+        models.CharField(max_length=50, blank=True),
+        depends_on=('name',)
+    )
+    def upper_name(self):
+        return self.name.upper()
+
+
+class LazyDenormalisedModel(BaseModel):
+    objects = DenormalisedQuerySet.as_manager()
+
+    calculated_fields = Denormalised(BaseModel, lazy=True)
+
+    @calculated_fields.property(
+        models.CharField(max_length=100)
+    )
+    def bar(self):
+        return 'bar'
@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock, Mock
 from django_ontruck.notifiers import (
-    AsyncNotifier, MQNotifier, PushNotifier, SegmentNotifier, SlackNotifier, SMSNotifier, CustomerIONotifier,
+    AsyncNotifier, MQNotifier, MQKombuClient, PushNotifier, SegmentNotifier, SlackNotifier, SMSNotifier,
+    BulkSMSNotifier, CustomerIONotifier, CompositeNotifier,
 )
 from django_ontruck.notifiers.push import Message, Category
 
@@ -56,6 +57,18 @@ class DummyMQWithInvalidMessageNotifier(MQNotifier):
         return m
 
 
+class DummyMQKombuNotifier(MQNotifier):
+    async_class = DummyAsyncNotifier
+
+    @property
+    def client(self):
+        return MQKombuClient.for_url('memory://')
+
+    @property
+    def message(self):
+        return {'body': 'sample message'}
+
+
 class DummyMessage(Message):
     @property
     def extra(self):
@@ -139,6 +152,15 @@ class DummySMSNotifier(SMSNotifier):
         return 'sender'
 
 
+class DummyBulkSMSNotifier(BulkSMSNotifier):
+    async_class = DummyAsyncNotifier
+    rate = 1000
+
+    @property
+    def sender_name(self):
+        return 'sender'
+
+
 class DummyCustomerIONotifier(CustomerIONotifier):
     async_class = DummyAsyncNotifier
 
@@ -157,3 +179,8 @@ class DummyCustomerIONotifier(CustomerIONotifier):
     @property
     def message(self) -> str:
         return "message"
+
+
+class DummyCompositeNotifier(CompositeNotifier):
+    async_class = DummyAsyncNotifier
+    notifier_classes = (DummySlackNotifier, DummySegmentNotifier)
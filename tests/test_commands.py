@@ -1,7 +1,12 @@
 from six import StringIO
+import json
 import shutil
 import os
 from django.core.management import call_command
+from django.core.management.base import CommandError
+from pytest import mark, raises
+
+from .test_app.models import DenormalisedModel, DependentDenormalisedModel
 
 class TestCommands:
 
@@ -45,4 +50,67 @@ class TestCommands:
 
         for expected_filepath in expected_files:
             assert '{}/{}'.format(app_name, expected_filepath) in app_file_paths
-        shutil.rmtree(app_name)
\ No newline at end of file
+        shutil.rmtree(app_name)
+
+    @mark.django_db
+    def test_rebuild_denormalised(self, mocker):
+        mocker.patch('sys.stdout', new_callable=StringIO)
+        instances = [DenormalisedModel.objects.create() for _ in range(3)]
+
+        call_command('rebuild_denormalised', 'test_app.DenormalisedModel', chunk_size=2)
+
+        for instance in instances:
+            instance.refresh_from_db()
+            assert instance.calculated_fields.bar == 'bar'
+            assert instance.calculated_fields.baz == 'baz'
+
+    @mark.django_db
+    def test_rebuild_denormalised_fields(self, mocker):
+        mocker.patch('sys.stdout', new_callable=StringIO)
+        instance = DenormalisedModel.objects.create()
+
+        call_command('rebuild_denormalised', 'test_app.DenormalisedModel.calculated_fields', fields=['bar'])
+
+        instance.refresh_from_db()
+        assert instance.calculated_fields.bar == 'bar'
+        assert not instance.calculated_fields.baz
+
+    @mark.django_db
+    def test_rebuild_denormalised_resumes_from_checkpoint(self, mocker, tmp_path):
+        mocker.patch('sys.stdout', new_callable=StringIO)
+        checkpoint = str(tmp_path / 'checkpoint.json')
+        first, second = DenormalisedModel.objects.create(), DenormalisedModel.objects.create()
+
+        with open(checkpoint, 'w') as checkpoint_file:
+            json.dump({'test_app.DenormalisedModel.calculated_fields': [[first.pk, first.pk + 1]]}, checkpoint_file)
+
+        call_command('rebuild_denormalised', 'test_app.DenormalisedModel', chunk_size=1, checkpoint=checkpoint)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert not first.calculated_fields.bar
+        assert second.calculated_fields.bar == 'bar'
+
+        with open(checkpoint) as checkpoint_file:
+            assert len(json.load(checkpoint_file)['test_app.DenormalisedModel.calculated_fields']) == 2
+
+    @mark.django_db
+    def test_rebuild_denormalised_fields_of_every_descriptor(self, mocker):
+        mocker.patch('sys.stdout', new_callable=StringIO)
+        instance = DenormalisedModel.objects.create()
+        DependentDenormalisedModel.objects.create(quantity=2, name='foo')
+
+        # DependentDenormalisedModel has no `bar` property and is skipped
+        call_command('rebuild_denormalised', fields=['bar'])
+
+        instance.refresh_from_db()
+        assert instance.calculated_fields.bar == 'bar'
+        assert not instance.calculated_fields.baz
+
+    def test_rebuild_denormalised_unknown_fields(self):
+        with raises(CommandError):
+            call_command('rebuild_denormalised', 'test_app.DenormalisedModel', fields=['nope'])
+
+    def test_rebuild_denormalised_unknown_descriptor(self):
+        with raises(CommandError):
+            call_command('rebuild_denormalised', 'test_app.FooModel')
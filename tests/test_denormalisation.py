@@ -1,14 +1,17 @@
 from json import dumps
-from unittest.mock import create_autospec
+from unittest.mock import create_autospec, MagicMock
 
-from django.db.models import Model, prefetch_related_objects
+from django.db import transaction
+from django.db.models import Model, QuerySet, prefetch_related_objects
 from pytest import fixture, mark, raises
 
 from django_ontruck.denormalisation import constantise, Denormaliser, Denormalise, serialise_denormaliser, \
-    deserialise_denormaliser, skip_denormalisation, Denormalised, EventListener
+    deserialise_denormaliser, skip_denormalisation, Denormalised, EventListener, CoalescingHandler, write_stats, \
+    AsyncHandler, denormalise_serialised, denormalisation_measured, BulkDenormaliser
 from django_ontruck.models import BaseModel
 from tests.test_app.events.events import BarEvent, baz
-from tests.test_app.models import DenormalisedModel, FooModel, DefaultDenormalisedModel
+from tests.test_app.models import DenormalisedModel, FooModel, DefaultDenormalisedModel, \
+    DependentDenormalisedModel, LazyDenormalisedModel
 
 
 class TestDenormalisation:
@@ -71,6 +74,31 @@ class TestDenormalisation:
             assert instance.calculated_fields.bar == 'bar'
             assert instance.calculated_fields.baz == 'baz'
 
+        @mark.django_db
+        def test_it_updates_the_cached_denormalised_instance_in_place(
+            self, instance, django_assert_num_queries
+        ):
+            cached = instance.calculated_fields
+
+            # select denormalised row, update
+            with django_assert_num_queries(2):
+                DenormalisedModel.calculated_fields.denormalise(instance)
+
+            assert instance.calculated_fields is cached
+            assert cached.bar == 'bar'
+
+        @mark.django_db
+        def test_it_refreshes_the_instance_on_demand(
+            self, instance, django_assert_num_queries
+        ):
+            # select denormalised row, update, refresh
+            with django_assert_num_queries(3):
+                DenormalisedModel.calculated_fields.denormalise(
+                    instance, refresh_after_update=True
+                )
+
+            assert instance.calculated_fields.bar == 'bar'
+
         def test_it_listens_to_denormalise_events(self):
             assert Denormalise.signal.has_listeners(
                 sender=DenormalisedModel.calculated_fields
@@ -135,6 +163,520 @@ class TestDenormalisation:
                     sender=DefaultDenormalisedModel.calculated_fields
                 )
 
+    class TestLazyCreation:
+        @fixture
+        def instance(self):
+            return LazyDenormalisedModel.objects.create()
+
+        @fixture
+        def model_class(self):
+            return LazyDenormalisedModel.calculated_fields.model_class
+
+        @mark.django_db
+        def test_it_does_not_create_the_denormalised_instance_eagerly(
+            self, instance, model_class
+        ):
+            assert not model_class.objects.exists()
+
+        @mark.django_db
+        def test_it_creates_the_denormalised_instance_on_access(
+            self, instance, model_class
+        ):
+            assert instance.calculated_fields.parent == instance
+            assert instance.calculated_fields is instance.calculated_fields
+            assert model_class.objects.count() == 1
+
+        @mark.django_db
+        def test_it_creates_the_denormalised_instance_on_denormalisation(
+            self, instance
+        ):
+            LazyDenormalisedModel.calculated_fields.denormalise(instance)
+
+            assert instance.calculated_fields.bar == 'bar'
+
+        @mark.django_db
+        def test_bulk_create_does_not_create_lazy_denormalised_instances(
+            self, model_class
+        ):
+            LazyDenormalisedModel.objects.bulk_create(
+                [LazyDenormalisedModel(id=1), LazyDenormalisedModel(id=2)]
+            )
+
+            assert not model_class.objects.exists()
+
+    class TestBulkCreate:
+        @mark.django_db
+        def test_it_creates_the_denormalised_instances_in_one_query(
+            self, django_assert_num_queries
+        ):
+            # insert parents, insert denormalised instances
+            with django_assert_num_queries(2):
+                instances = DenormalisedModel.objects.bulk_create(
+                    [DenormalisedModel(id=1), DenormalisedModel(id=2)]
+                )
+
+            for instance in instances:
+                assert instance.calculated_fields.denormalised_model == instance
+
+        @mark.django_db
+        def test_it_ignores_conflicts_with_existing_instances(self):
+            existing = DenormalisedModel.objects.create(id=5)
+
+            DenormalisedModel.objects.bulk_create(
+                [DenormalisedModel(id=5), DenormalisedModel(id=6)],
+                ignore_conflicts=True,
+            )
+
+            assert DenormalisedModel.calculated_fields.model_class.objects.filter(
+                denormalised_model__in=[existing.pk, 6]
+            ).count() == 2
+
+    class TestWithDenormalised:
+        @fixture
+        def instances(self):
+            instances = [DenormalisedModel.objects.create() for _ in range(2)]
+            DenormalisedModel.calculated_fields.denormalise(instances[0], ('bar',))
+
+            return instances
+
+        @mark.django_db
+        def test_it_annotates_the_denormalised_properties(self, instances):
+            queryset = DenormalisedModel.objects.with_denormalised(
+                'calculated_fields'
+            ).order_by('id')
+
+            assert [
+                (instance.calculated_fields_bar, instance.calculated_fields_baz)
+                for instance in queryset
+            ] == [('bar', ''), ('', '')]
+
+        @mark.django_db
+        def test_it_filters_by_the_denormalised_properties(self, instances):
+            assert list(
+                DenormalisedModel.objects.with_denormalised(
+                    'calculated_fields', prefix='denormalised_'
+                ).filter(denormalised_baz='', denormalised_bar='bar')
+            ) == [instances[0]]
+
+        def test_it_rejects_annotations_clashing_with_attributes(self):
+            with raises(ValueError):
+                DenormalisedModel.objects.with_denormalised(
+                    'calculated_fields', prefix=''
+                )
+
+        @mark.django_db
+        def test_it_selects_the_denormalised_instances(
+            self, instances, django_assert_num_queries
+        ):
+            with django_assert_num_queries(1):
+                assert [
+                    instance.calculated_fields.bar for instance in
+                    DenormalisedModel.objects.with_denormalised('calculated_fields').order_by('id')
+                ] == ['bar', '']
+
+    class TestDependencies:
+        @fixture
+        def instance(self):
+            return DependentDenormalisedModel.objects.create(quantity=2, name='foo')
+
+        @fixture
+        def denormalised_fields(self):
+            fields = []
+
+            def receiver(denormaliser, **_kwargs):
+                fields.append(tuple(denormaliser.fields))
+
+            Denormalise.connect(
+                receiver, sender=DependentDenormalisedModel.calculated_fields
+            )
+
+            yield fields
+
+            Denormalise.disconnect(
+                receiver, sender=DependentDenormalisedModel.calculated_fields
+            )
+
+        def test_dependent_fields(self):
+            assert DependentDenormalisedModel.calculated_fields.dependent_fields(
+                ('quantity', 'deleted')
+            ) == ('double_quantity',)
+
+        def test_tracked_fields_are_computed_once(self):
+            calculated_fields = DependentDenormalisedModel.calculated_fields
+
+            assert [field.name for field in calculated_fields.tracked_fields] == ['quantity', 'name']
+            assert calculated_fields.tracked_fields is calculated_fields.tracked_fields
+
+        @mark.django_db
+        def test_it_denormalises_every_property_on_creation(self, instance):
+            assert instance.calculated_fields.double_quantity == 4
+            assert instance.calculated_fields.upper_name == 'FOO'
+
+        @mark.django_db
+        def test_it_denormalises_the_properties_depending_on_changed_fields(
+            self, instance, denormalised_fields
+        ):
+            instance.quantity = 3
+            instance.save()
+
+            assert denormalised_fields == [('double_quantity',)]
+            assert instance.calculated_fields.double_quantity == 6
+
+        @mark.django_db
+        def test_it_denormalises_the_properties_depending_on_update_fields(
+            self, instance, denormalised_fields
+        ):
+            instance.name = 'bar'
+            instance.save(update_fields=('name',))
+
+            assert denormalised_fields == [('upper_name',)]
+            assert instance.calculated_fields.upper_name == 'BAR'
+
+        @mark.django_db
+        def test_it_does_not_denormalise_when_no_dependency_changed(
+            self, instance, denormalised_fields
+        ):
+            instance.deleted = True
+            instance.save()
+
+            assert denormalised_fields == []
+
+        @mark.django_db
+        def test_changes_are_tracked_from_loaded_instances(self, instance):
+            loaded = DependentDenormalisedModel.objects.get(id=instance.id)
+            loaded.name = 'bar'
+
+            assert (
+                DependentDenormalisedModel.calculated_fields.changed_fields(loaded) ==
+                ('name',)
+            )
+
+        @mark.django_db
+        def test_refreshed_instances_are_compared_with_a_new_snapshot(self, instance):
+            loaded = DependentDenormalisedModel.objects.get(id=instance.id)
+            loaded.quantity = 3
+            loaded.save()
+
+            instance.refresh_from_db()
+            DependentDenormalisedModel.calculated_fields.take_snapshot(instance)
+
+            instance.quantity = 2
+            instance.save()
+
+            assert instance.calculated_fields.double_quantity == 4
+
+        @mark.django_db
+        def test_refreshing_after_a_denormalisation_retakes_the_snapshot(self, instance):
+            DependentDenormalisedModel.objects.filter(id=instance.id).update(quantity=3)
+            instance.quantity = 3
+            DependentDenormalisedModel.calculated_fields.denormalise(
+                instance, refresh_after_update=True
+            )
+
+            instance.quantity = 2
+            instance.save()
+
+            assert instance.calculated_fields.double_quantity == 4
+
+    class TestSkippingUnchangedWrites:
+        @fixture
+        def instance(self):
+            return DenormalisedModel.objects.create()
+
+        @fixture
+        def model_class(self):
+            return DenormalisedModel.calculated_fields.model_class
+
+        @fixture(autouse=True)
+        def reset_write_stats(self):
+            write_stats.reset()
+
+        @mark.django_db
+        def test_it_counts_written_rows(self, instance, model_class):
+            DenormalisedModel.calculated_fields.denormalise(instance)
+
+            assert write_stats[model_class].written == 1
+            assert write_stats[model_class].skipped == 0
+
+        @mark.django_db
+        def test_it_skips_unchanged_rows(self, instance, model_class):
+            DenormalisedModel.calculated_fields.denormalise(instance)
+            DenormalisedModel.calculated_fields.denormalise(instance)
+
+            assert write_stats[model_class].written == 1
+            assert write_stats[model_class].skipped == 1
+
+        @mark.django_db
+        def test_it_does_not_update_unchanged_rows(
+            self, instance, django_assert_num_queries
+        ):
+            DenormalisedModel.calculated_fields.denormalise(instance)
+
+            # select denormalised row, no update
+            with django_assert_num_queries(1):
+                DenormalisedModel.calculated_fields.denormalise(instance)
+
+        @mark.django_db
+        def test_bulk_denormalisation_skips_unchanged_rows(
+            self, instance, model_class
+        ):
+            DenormalisedModel.calculated_fields.denormalise(instance)
+            write_stats.reset()
+
+            DenormalisedModel.calculated_fields.denormalise_queryset(
+                DenormalisedModel.objects.all()
+            )
+
+            assert write_stats[model_class].written == 0
+            assert write_stats[model_class].skipped == 1
+
+    class TestConcurrentCreation:
+        @fixture
+        def instance(self):
+            instance = DenormalisedModel.objects.create()
+            DenormalisedModel.calculated_fields.denormalise(instance, ('bar',))
+
+            return instance
+
+        @fixture
+        def model_class(self):
+            return DenormalisedModel.calculated_fields.model_class
+
+        @mark.django_db
+        def test_it_updates_rows_created_by_a_concurrent_write(
+            self, instance, model_class, mocker
+        ):
+            get = QuerySet.get
+            missed = []
+
+            def racing_get(queryset, *args, **kwargs):
+                # the first read misses the row another write is creating
+                if queryset.model is model_class and not missed:
+                    missed.append(True)
+                    raise model_class.DoesNotExist()
+
+                return get(queryset, *args, **kwargs)
+
+            mocker.patch.object(QuerySet, 'get', racing_get)
+
+            DenormalisedModel.calculated_fields.denormalise(instance)
+
+            assert model_class.objects.get(denormalised_model=instance).baz == 'baz'
+
+        @mark.django_db
+        def test_bulk_denormalisation_ignores_rows_created_concurrently(
+            self, instance, model_class, mocker
+        ):
+            mocker.patch.object(BulkDenormaliser, 'existing', return_value={})
+
+            DenormalisedModel.calculated_fields.denormalise_queryset(
+                DenormalisedModel.objects.all()
+            )
+
+            assert model_class.objects.count() == 1
+
+    class TestInstrumentation:
+        @fixture
+        def instance(self):
+            return DenormalisedModel.objects.create()
+
+        @fixture
+        def model_class(self):
+            return DenormalisedModel.calculated_fields.model_class
+
+        @fixture
+        def measured(self, model_class):
+            measured = []
+
+            def receiver(metrics, **_kwargs):
+                measured.append(metrics)
+
+            denormalisation_measured.connect(receiver, sender=model_class)
+
+            yield measured
+
+            denormalisation_measured.disconnect(receiver, sender=model_class)
+
+        @mark.django_db
+        def test_it_measures_each_phase_of_a_denormalisation(
+            self, instance, measured
+        ):
+            DenormalisedModel.calculated_fields.denormalise(instance)
+
+            metrics, = measured
+
+            assert metrics.rows == 1
+            assert metrics.prefetch.queries == 0
+            assert metrics.compute.queries == 0
+            # select denormalised row, update
+            assert metrics.write.queries == 2
+            assert metrics.duration >= 0
+            assert metrics.lag >= 0
+
+        @mark.django_db
+        def test_it_measures_bulk_denormalisations(self, instance, measured):
+            DenormalisedModel.objects.create()
+
+            DenormalisedModel.calculated_fields.denormalise_queryset(
+                DenormalisedModel.objects.all()
+            )
+
+            metrics, = measured
+
+            assert metrics.rows == 2
+            assert metrics.lag is None
+
+        @mark.django_db
+        def test_it_measures_nothing_without_receivers(self, measured):
+            DefaultDenormalisedModel.calculated_fields.denormalise(
+                DefaultDenormalisedModel.objects.create()
+            )
+
+            assert not measured
+
+    class TestBulkDenormalisation:
+        @fixture
+        def instances(self):
+            return [DenormalisedModel.objects.create() for _ in range(3)]
+
+        @mark.django_db
+        def test_it_denormalises_every_instance_of_the_queryset(self, instances):
+            DenormalisedModel.calculated_fields.denormalise_queryset(
+                DenormalisedModel.objects.all(), batch_size=2
+            )
+
+            for instance in DenormalisedModel.objects.all():
+                assert instance.calculated_fields.bar == 'bar'
+                assert instance.calculated_fields.baz == 'baz'
+
+        @mark.django_db
+        def test_it_only_denormalises_the_given_fields(self, instances):
+            DenormalisedModel.calculated_fields.denormalise_queryset(
+                DenormalisedModel.objects.all(), fields=('bar',)
+            )
+
+            for instance in DenormalisedModel.objects.all():
+                assert instance.calculated_fields.bar == 'bar'
+                assert not instance.calculated_fields.baz
+
+        @mark.django_db
+        def test_it_creates_missing_denormalised_instances(self, instances):
+            model_class = DenormalisedModel.calculated_fields.model_class
+            model_class.objects.filter(denormalised_model=instances[0]).delete()
+
+            DenormalisedModel.calculated_fields.denormalise_queryset(
+                DenormalisedModel.objects.all()
+            )
+
+            assert model_class.objects.count() == len(instances)
+            assert model_class.objects.get(
+                denormalised_model=instances[0]
+            ).bar == 'bar'
+
+        @mark.django_db
+        def test_it_runs_a_constant_number_of_queries_per_batch(
+            self, instances, django_assert_num_queries
+        ):
+            # select parents, select denormalised rows, bulk update
+            with django_assert_num_queries(3):
+                DenormalisedModel.calculated_fields.denormalise_queryset(
+                    DenormalisedModel.objects.all()
+                )
+
+    class TestCoalescingHandler:
+        @fixture
+        def callbacks(self):
+            return []
+
+        @fixture
+        def handler(self):
+            return create_autospec(lambda denormaliser: None)
+
+        @fixture
+        def coalescing_handler(self, handler, callbacks):
+            return CoalescingHandler(
+                handler=handler,
+                on_commit=callbacks.append,
+                is_scheduled=lambda flush: any(callback.func == flush for callback in callbacks),
+            )
+
+        @fixture
+        def instance(self):
+            return DenormalisedModel.objects.create()
+
+        @staticmethod
+        def commit(callbacks):
+            while callbacks:
+                callbacks.pop(0)()
+
+        @mark.django_db
+        def test_it_waits_for_the_transaction_to_commit(
+            self, coalescing_handler, handler, instance
+        ):
+            coalescing_handler(
+                DenormalisedModel.calculated_fields.denormaliser(instance, ('bar',))
+            )
+
+            assert not handler.called
+
+        @mark.django_db
+        def test_it_merges_the_fields_of_the_same_instance(
+            self, coalescing_handler, handler, callbacks, instance
+        ):
+            for fields in (('bar',), ('baz',), ('bar',)):
+                coalescing_handler(
+                    DenormalisedModel.calculated_fields.denormaliser(instance, fields)
+                )
+
+            self.commit(callbacks)
+
+            handler.assert_called_once_with(
+                DenormalisedModel.calculated_fields.denormaliser(
+                    instance, ('bar', 'baz')
+                )
+            )
+
+        @mark.django_db
+        def test_it_handles_different_instances_separately(
+            self, coalescing_handler, handler, callbacks
+        ):
+            for instance in (DenormalisedModel.objects.create() for _ in range(2)):
+                coalescing_handler(
+                    DenormalisedModel.calculated_fields.denormaliser(instance, ('bar',))
+                )
+
+            self.commit(callbacks)
+
+            assert handler.call_count == 2
+
+        @mark.django_db
+        def test_it_keeps_the_first_trigger_time(
+            self, coalescing_handler, handler, callbacks, instance
+        ):
+            for triggered_at in (2.0, 1.0, 3.0):
+                coalescing_handler(
+                    DenormalisedModel.calculated_fields.denormaliser(instance, ('bar',), triggered_at)
+                )
+
+            self.commit(callbacks)
+
+            assert handler.call_args[0][0].triggered_at == 1.0
+
+        @mark.django_db
+        def test_it_discards_the_denormalisers_of_rolled_back_transactions(self, handler):
+            coalescing_handler = CoalescingHandler(handler=handler)
+            first, second = DenormalisedModel.objects.create(), DenormalisedModel.objects.create()
+
+            with raises(ValueError):
+                with transaction.atomic():
+                    coalescing_handler(DenormalisedModel.calculated_fields.denormaliser(first, ('bar',)))
+
+                    raise ValueError()
+
+            coalescing_handler(DenormalisedModel.calculated_fields.denormaliser(second, ('bar',)))
+
+            assert [pk for _, pk in coalescing_handler.pending] == [second.pk]
+
     class TestSerialisation:
         @fixture
         def instance(self):
@@ -187,6 +729,111 @@ class TestDenormalisation:
 
             assert deserialised == denormaliser
 
+    class TestAsyncHandler:
+        @fixture
+        def callbacks(self):
+            return []
+
+        @fixture
+        def task(self):
+            return MagicMock()
+
+        @fixture
+        def async_handler(self, task, callbacks):
+            return AsyncHandler(
+                task, queue='denormalisation', batch_size=2, on_commit=callbacks.append,
+                is_scheduled=lambda flush: flush in callbacks,
+            )
+
+        @fixture
+        def instances(self):
+            return [DenormalisedModel.objects.create() for _ in range(3)]
+
+        @staticmethod
+        def commit(callbacks):
+            while callbacks:
+                callbacks.pop(0)()
+
+        @mark.django_db
+        def test_it_sends_serialised_denormalisers_in_batches_on_commit(
+            self, async_handler, task, callbacks, instances
+        ):
+            denormalisers = [
+                DenormalisedModel.calculated_fields.denormaliser(instance, ('bar',))
+                for instance in instances
+            ]
+
+            for denormaliser in denormalisers:
+                async_handler(denormaliser)
+
+            assert not task.s.called
+
+            self.commit(callbacks)
+
+            assert [call.args[0] for call in task.s.call_args_list] == [
+                [serialise_denormaliser(denormaliser) for denormaliser in denormalisers[:2]],
+                [serialise_denormaliser(denormalisers[2])],
+            ]
+            task.s.return_value.apply_async.assert_called_with(queue='denormalisation')
+
+        @mark.django_db
+        def test_it_discards_the_denormalisers_of_rolled_back_transactions(self, task, instances):
+            async_handler = AsyncHandler(task)
+            first, second = [
+                DenormalisedModel.calculated_fields.denormaliser(instance, ('bar',)) for instance in instances[:2]
+            ]
+
+            with raises(ValueError):
+                with transaction.atomic():
+                    async_handler(first)
+
+                    raise ValueError()
+
+            async_handler(second)
+
+            assert async_handler.pending == [serialise_denormaliser(second)]
+
+        @mark.django_db
+        def test_the_worker_denormalises_each_group_in_bulk(
+            self, instances, django_assert_num_queries
+        ):
+            denormalisers_data = [
+                serialise_denormaliser(
+                    DenormalisedModel.calculated_fields.denormaliser(instance, fields)
+                )
+                for instance in instances for fields in (('bar',), ('baz',))
+            ]
+
+            # select parents, select denormalised rows, bulk update
+            with django_assert_num_queries(3):
+                denormalise_serialised(denormalisers_data)
+
+            for instance in instances:
+                instance.refresh_from_db()
+
+                assert instance.calculated_fields.bar == 'bar'
+                assert instance.calculated_fields.baz == 'baz'
+
+        @mark.django_db
+        def test_the_worker_only_recomputes_the_fields_of_each_instance(
+            self, instances
+        ):
+            denormalisers_data = [
+                serialise_denormaliser(
+                    DenormalisedModel.calculated_fields.denormaliser(instance, fields)
+                )
+                for instance, fields in zip(instances, (('bar',), ('baz',)))
+            ]
+
+            denormalise_serialised(denormalisers_data)
+
+            first, second = [
+                DenormalisedModel.objects.get(pk=instance.pk).calculated_fields
+                for instance in instances[:2]
+            ]
+            assert (first.bar, first.baz) == ('bar', '')
+            assert (second.bar, second.baz) == ('', 'baz')
+
     class TestListener:
         @fixture
         def mock_denormalise_event(self):